@@ -3,14 +3,17 @@
 Main Flask application for AI Social Media Post Generator
 """
 
+import functools
 import os
-from flask import Flask, request, jsonify
+import pathlib
+import queue
+from flask import Flask, Response, request, jsonify
+from werkzeug.exceptions import HTTPException
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 # Structured logging setup must occur before other imports configure logging
 import sys
-import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from logging import getLogger
 from app_logging.logger_config import setup_logger
@@ -28,15 +31,22 @@ from services.upload_handler import AudioUploadHandler
 from services.whisper_service import WhisperService
 from services.text_generation.flan_t5_service import flan_t5_service
 from services.text_generation.content_processor import ContentProcessor
+from services.text_generation.post_generator import post_generator, platform_configs, PostTone
 from services.text_generation.post_storage import post_storage
-from templates.platform_templates import get_template
+from templates.platform_templates import get_formatter
+from performance.generation_cache import cache_key
+from performance.response_optimizer import client_has_etag
 
 # Load environment variables
 load_dotenv()
 
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": os.getenv('CORS_ORIGINS', '*')}})
+CORS(app, resources={r"/*": {"origins": os.getenv('CORS_ORIGINS', '*')}}, expose_headers=['ETag'])
+
+# Serialise JSON responses with orjson
+from performance.json_provider import init_json_provider  # noqa: E402
+init_json_provider(app)
 
 # Logger already configured globally via logger_config; retain `logger` defined above
 
@@ -50,232 +60,332 @@ whisper_service = WhisperService(
     model_name=os.getenv('WHISPER_MODEL', 'base')
 )
 
+content_processor = ContentProcessor()
+
+# Request-independent lookups, built once at import
+TONES = {tone.value: tone for tone in PostTone}
+
+TONE_DESCRIPTIONS = {
+    'witty': 'Clever and humorous posts with wordplay and smart observations',
+    'professional': 'Clear, authoritative posts focused on key insights',
+    'motivational': 'Inspiring and uplifting content that encourages action',
+    'casual': 'Friendly, conversational posts that feel relatable',
+    'educational': 'Informative content focused on teaching and explaining',
+    'humorous': 'Funny and entertaining posts designed to make people smile',
+    'inspirational': 'Hope-focused content about dreams and positive transformation',
+    'urgent': 'Action-oriented posts that create a sense of immediacy'
+}
+
+# /api/tones is static for the life of the process, so serialise it once
+TONES_RESPONSE_BODY = app.json.dumps({
+    'tones': [{
+        'value': tone.value,
+        'name': tone.value.title().replace('_', ' '),
+        'description': TONE_DESCRIPTIONS.get(tone.value, f'Posts with {tone.value} tone')
+    } for tone in PostTone],
+    'default': 'professional'
+}).encode()
+
 # Start background memory manager
-from performance.memory_manager import MemoryManager  # noqa: E402
+from performance.memory_manager import MemoryManager, freeze_resident_objects  # noqa: E402
 _memory_manager = MemoryManager()
 _memory_manager.start()
 
 # Worker pool for concurrent heavy tasks
 from performance.worker_manager import WorkerManager  # noqa: E402
-import threading
 
 _worker_manager = WorkerManager(max_workers=int(os.getenv('MAX_WORKERS', 4)))
 
-def run_sync_in_worker(fn, *, description="job"):
-    """Run *fn* inside worker pool synchronously and return the result."""
-    completed = threading.Event()
-    container = {}
+def _body():
+    """Parse the JSON request body once, without content-type checks or caching."""
+    return request.get_json(force=True, silent=True, cache=False) or {}
 
-    def _wrap():  # noqa: D401
-        container['result'] = fn()
-        completed.set()
+# With WhisperS2T installed, concurrent transcription requests are grouped into
+# batched Whisper calls; otherwise they run in parallel on the worker pool
+from services.whisper_batcher import WhisperBatcher  # noqa: E402
 
-    _worker_manager.submit_job(_wrap, description=description)
-    completed.wait()
-    return container.get('result')
+whisper_batcher = None
+if whisper_service.supports_batching:
+    whisper_batcher = WhisperBatcher(whisper_service)
+    whisper_batcher.start()
 
-# Load Whisper and FLAN-T5 models on startup
-try:
-    whisper_service.load_whisper_model()
-    flan_t5_service.load_model()
-    logger.info("Models loaded successfully on startup")
-except Exception as e:
-    logger.error(f"Failed to load models on startup: {e}")
+# Models load lazily on first use; PRELOAD_MODELS=1 loads them on startup instead
+if os.getenv('PRELOAD_MODELS') == '1':
+    try:
+        whisper_service.load_whisper_model()
+        flan_t5_service.load_model()
+        freeze_resident_objects()
+        logger.info("Models loaded successfully on startup")
+    except Exception as e:
+        logger.error(f"Failed to load models on startup: {e}")
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
     """Upload audio file"""
-    try:
-        # Check if file is present
-        if 'file' not in request.files:
-            return jsonify({
-                'success': False,
-                'error': 'No file provided'
-            }), 400
-        
-        file = request.files['file']
-        
-        # Handle file upload
-        result = upload_handler.save_audio_file(file)
+    # Check if file is present
+    if 'file' not in request.files:
+        return jsonify({
+            'success': False,
+            'error': 'No file provided'
+        }), 400
+    
+    file = request.files['file']
+    
+    # Handle file upload
+    result = upload_handler.save_audio_file(file)
+    
+    if result['success']:
+        # Compute Whisper features while the client moves on to /api/transcribe;
+        # skipped until the model is loaded so uploads never force the load
+        if whisper_service.model is not None:
+            file_path = upload_handler.get_file_metadata(result['file_id'])['file_path']
+            _worker_manager.submit_job(
+                lambda: whisper_service.precompute_features(file_path),
+                description=f"precompute-features-{result['file_id']}"
+            )
         
-        if result['success']:
-            return jsonify({
-                'file_id': result['file_id'],
-                'status': 'uploaded',
-                'filename': result['filename'],
-                'size': result['size'],
-                'duration': result['duration'],
-                'format': result['format']
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'errors': result['errors']
-            }), 400
-            
-    except Exception as e:
-        logger.error(f"Error in upload endpoint: {str(e)}")
+        return jsonify({
+            'file_id': result['file_id'],
+            'status': 'uploaded',
+            'filename': result['filename'],
+            'size': result['size'],
+            'duration': result['duration'],
+            'format': result['format']
+        }), 200
+    else:
         return jsonify({
             'success': False,
-            'error': 'Internal server error'
-        }), 500
+            'errors': result['errors']
+        }), 400
+        
 
-@app.route('/api/transcribe', methods=['POST'])
-def transcribe_audio():
-    """Start transcription process"""
+def _store_transcription(file_id, transcription_id, future):
+    """Persist a finished transcription job under its pre-allocated id."""
     try:
-        logger.info("[ENDPOINT] /api/transcribe called")
-        data = request.get_json()
-        logger.info(f"[ENDPOINT] Request data: {data}")
-        
-        if not data or 'file_id' not in data:
-            logger.error("[ENDPOINT] No file_id provided")
-            return jsonify({
-                'success': False,
-                'error': 'No file_id provided'
-            }), 400
-        
-        file_id = data['file_id']
-        logger.info(f"[ENDPOINT] Processing file_id: {file_id}")
-        
-        # Get file metadata
-        file_metadata = upload_handler.get_file_metadata(file_id)
-        if not file_metadata:
-            logger.error(f"[ENDPOINT] File not found: {file_id}")
-            return jsonify({
-                'success': False,
-                'error': 'File not found'
-            }), 404
-        
-        logger.info(f"[ENDPOINT] File metadata: {file_metadata}")
-        
-        # Start transcription in worker
-        file_path = file_metadata['file_path']
-        logger.info(f"[ENDPOINT] Submitting transcription job for: {file_path}")
-        
-        def transcribe_job():
-            logger.info(f"[WORKER] Starting transcription job for: {file_path}")
-            result = whisper_service.transcribe_audio(file_path)
-            logger.info(f"[WORKER] Transcription job completed with status: {result.get('status', 'unknown')}")
-            return result
-        
-        transcription_result = run_sync_in_worker(transcribe_job, description=f"transcription-{file_id}")
-        logger.info(f"[ENDPOINT] Worker completed, saving transcription")
-        
-        # Save transcription
-        whisper_service.save_transcription(file_id, transcription_result)
-        logger.info(f"[ENDPOINT] Transcription saved successfully")
-        
-        response_data = {
-            'transcription_id': transcription_result['transcription_id'],
-            'status': transcription_result['status'],
-            'text': transcription_result['text'],
-            'language': transcription_result['language'],
-            'confidence': transcription_result['confidence_metrics']['overall_confidence'],
-            'processing_time': transcription_result['processing_time']
-        }
-        logger.info(f"[ENDPOINT] Returning response: status={transcription_result['status']}, text_length={len(transcription_result['text'])}")
-        
-        return jsonify(response_data), 200
-        
+        transcription_result = future.result()
     except Exception as e:
-        logger.error(f"Error in transcription endpoint: {str(e)}")
+        logger.error(f"Transcription job failed for {file_id}: {e}")
+        transcription_result = whisper_service.get_transcription(transcription_id) or {}
+        transcription_result.update({'status': 'failed', 'error': str(e)})
+    
+    transcription_result['transcription_id'] = transcription_id
+    whisper_service.save_transcription(file_id, transcription_result)
+    logger.info("[WORKER] Transcription %s saved with status: %s", transcription_id, transcription_result.get('status', 'unknown'))
+
+@app.route('/api/transcribe', methods=['POST'])
+def transcribe_audio():
+    """Queue transcription; poll /api/transcription/<id> for the result"""
+    logger.debug("[ENDPOINT] /api/transcribe called")
+    data = _body()
+    logger.debug("[ENDPOINT] Request data: %s", data)
+    
+    if not data or 'file_id' not in data:
+        logger.error("[ENDPOINT] No file_id provided")
         return jsonify({
             'success': False,
-            'error': 'Internal server error'
-        }), 500
+            'error': 'No file_id provided'
+        }), 400
+    
+    file_id = data['file_id']
+    logger.debug("[ENDPOINT] Processing file_id: %s", file_id)
+    
+    # Get file metadata
+    file_metadata = upload_handler.get_file_metadata(file_id)
+    if not file_metadata:
+        logger.error(f"[ENDPOINT] File not found: {file_id}")
+        return jsonify({
+            'success': False,
+            'error': 'File not found'
+        }), 404
+    
+    logger.debug("[ENDPOINT] File metadata: %s", file_metadata)
+    
+    # Reserve the transcription record, then queue the job
+    file_path = file_metadata['file_path']
+    pending = whisper_service.create_pending_transcription(file_id)
+    transcription_id = pending['transcription_id']
+    logger.info("[ENDPOINT] Queueing transcription %s for: %s", transcription_id, file_path)
+    
+    if whisper_batcher is not None:
+        future = whisper_batcher.submit(file_path)
+    else:
+        future = _worker_manager.submit_job(
+            functools.partial(whisper_service.transcribe_audio, file_path),
+            description="transcription"
+        )
+    future.add_done_callback(functools.partial(_store_transcription, file_id, transcription_id))
+    
+    return jsonify({
+        'transcription_id': transcription_id,
+        'status': pending['status']
+    }), 202
+
+def _sse(event, payload):
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {app.json.dumps(payload)}\n\n"
+
+@app.route('/api/transcribe/stream', methods=['POST'])
+def transcribe_audio_stream():
+    """Transcribe a file, streaming decoded segments as Server-Sent Events"""
+    data = _body()
+    if 'file_id' not in data:
+        return jsonify({
+            'success': False,
+            'error': 'No file_id provided'
+        }), 400
+    
+    file_id = data['file_id']
+    file_metadata = upload_handler.get_file_metadata(file_id)
+    if not file_metadata:
+        return jsonify({
+            'success': False,
+            'error': 'File not found'
+        }), 404
+    
+    file_path = file_metadata['file_path']
+    pending = whisper_service.create_pending_transcription(file_id)
+    transcription_id = pending['transcription_id']
+    logger.info(f"[ENDPOINT] Streaming transcription {transcription_id} for: {file_path}")
+    
+    # The pool worker pushes segments onto the queue; None marks the end of the job
+    segments = queue.Queue()
+    future = _worker_manager.submit_job(
+        functools.partial(whisper_service.transcribe_audio, file_path, on_segment=segments.put),
+        description="transcription-stream"
+    )
+    future.add_done_callback(functools.partial(_store_transcription, file_id, transcription_id))
+    future.add_done_callback(lambda _: segments.put(None))
+    
+    def events():
+        yield _sse('started', {'transcription_id': transcription_id})
+        while (segment := segments.get()) is not None:
+            yield _sse('segment', {
+                'segment_id': segment['id'],
+                'text': segment['text'],
+                'start': segment['start'],
+                'end': segment['end']
+            })
+        transcription = whisper_service.get_transcription(transcription_id) or {}
+        yield _sse('done', {
+            'transcription_id': transcription_id,
+            'status': transcription.get('status', 'unknown'),
+            'text': transcription.get('text', ''),
+            'error': transcription.get('error')
+        })
+    
+    return Response(events(), mimetype='text/event-stream', headers={'X-Accel-Buffering': 'no'})
 
 @app.route('/api/transcription/<transcription_id>', methods=['GET'])
 def get_transcription(transcription_id):
     """Get transcription status/result"""
-    try:
-        transcription = whisper_service.get_transcription(transcription_id)
-        
-        if not transcription:
-            return jsonify({
-                'success': False,
-                'error': 'Transcription not found'
-            }), 404
-        
-        return jsonify({
-            'status': transcription['status'],
-            'text': transcription['text'],
-            'language': transcription['language'],
-            'confidence': transcription['confidence_metrics']['overall_confidence'],
-            'processing_time': transcription['processing_time'],
-            'transcribed_at': transcription['transcribed_at']
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting transcription: {str(e)}")
+    transcription = whisper_service.get_transcription(transcription_id)
+    
+    if not transcription:
         return jsonify({
             'success': False,
-            'error': 'Internal server error'
-        }), 500
+            'error': 'Transcription not found'
+        }), 404
+    
+    # Clients that already hold this version of the record get an empty 304
+    etag = cache_key(
+        transcription_id,
+        transcription['status'],
+        transcription.get('transcribed_at'),
+        transcription.get('edited_at'),
+        len(transcription['text'])
+    )
+    if client_has_etag(etag):
+        response = app.response_class(status=304)
+        return _revalidate_with(response, etag)
+    
+    response_data = {
+        'transcription_id': transcription_id,
+        'status': transcription['status'],
+        'text': transcription['text'],
+        'language': transcription['language'],
+        'confidence': transcription['confidence_metrics']['overall_confidence'],
+        'processing_time': transcription['processing_time'],
+        'transcribed_at': transcription['transcribed_at']
+    }
+    if 'error' in transcription:
+        response_data['error'] = transcription['error']
+    
+    return _revalidate_with(jsonify(response_data), etag), 200
+
+def _revalidate_with(response, etag):
+    """Tag a poll response so clients may keep it but must revalidate before reuse."""
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/files/<file_id>', methods=['DELETE'])
 def delete_file(file_id):
     """Clean up uploaded file"""
-    try:
-        result = upload_handler.delete_file(file_id)
-        
-        if result['success']:
-            return jsonify({
-                'status': 'deleted',
-                'message': result['message']
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'error': result['error']
-            }), 400
-            
-    except Exception as e:
-        logger.error(f"Error deleting file: {str(e)}")
+    result = upload_handler.delete_file(file_id)
+    
+    if result['success']:
+        return jsonify({
+            'status': 'deleted',
+            'message': result['message']
+        }), 200
+    else:
         return jsonify({
             'success': False,
-            'error': 'Internal server error'
-        }), 500
+            'error': result['error']
+        }), 400
 
 # ---------------------------------------------------------------------------
 # Health & monitoring endpoints
 # ---------------------------------------------------------------------------
-from monitoring.system_monitor import capture_metrics  # noqa: E402
+from monitoring.system_monitor import cached_disk_usage, cached_metrics  # noqa: E402
 from monitoring.app_monitor import metric_store  # noqa: E402
 
 
+# Serialised health bodies, keyed by the model-load state they describe
+_state_bodies = {}
+
+def _state_response(state, build):
+    """Serve the JSON body for *state*, serialising *build()* only the first time."""
+    body = _state_bodies.get(state)
+    if body is None:
+        body = _state_bodies[state] = app.json.dumps(build()).encode()
+    return app.response_class(body, status=200, mimetype=app.json.mimetype)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    model_loaded = whisper_service.model is not None
+    return _state_response(('health', model_loaded), lambda: {
         'status': 'healthy',
         'whisper_model': whisper_service.model_name,
-        'model_loaded': whisper_service.model is not None
-    }), 200
+        'model_loaded': model_loaded
+    })
 
 
 @app.route('/api/health/detailed', methods=['GET'])
 def health_detailed():
     """Return detailed system status."""
-    sys_metrics = capture_metrics()
+    sys_metrics = cached_metrics()
     return jsonify(sys_metrics.to_dict()), 200
 
 
 @app.route('/api/health/models', methods=['GET'])
 def health_models():
     """Return status of AI models."""
-    return jsonify({
-        'whisper_loaded': whisper_service.model is not None,
-        'flan_t5_loaded': flan_t5_service.model is not None,
-    }), 200
+    whisper_loaded = whisper_service.model is not None
+    flan_t5_loaded = flan_t5_service.model is not None
+    return _state_response(('models', whisper_loaded, flan_t5_loaded), lambda: {
+        'whisper_loaded': whisper_loaded,
+        'flan_t5_loaded': flan_t5_loaded,
+    })
 
 
 @app.route('/api/health/storage', methods=['GET'])
 def health_storage():
     """Check storage space in upload directory."""
-    import shutil, pathlib
     upload_dir = pathlib.Path(upload_handler.upload_folder)
-    total, used, free = shutil.disk_usage(upload_dir)
+    total, used, free = cached_disk_usage(str(upload_dir))
     return jsonify({
         'upload_dir': str(upload_dir),
         'total_gb': total / 1024 ** 3,
@@ -289,6 +399,7 @@ def metrics():
     """Return basic performance metrics collected in memory."""
     return jsonify({
         'avg_response_ms': metric_store.avg_response_ms,
+        'p95_response_ms': metric_store.percentile_ms(95),
         'error_rate': metric_store.error_rate,
         'request_count': metric_store.request_count,
     }), 200
@@ -296,199 +407,172 @@ def metrics():
 @app.route('/api/generate-posts', methods=['POST'])
 def generate_posts():
     """Generate social media posts from transcription using advanced post generator"""
-    try:
-        data = request.get_json()
-
-        transcription_id = data.get('transcription_id')
-        platforms = data.get('platforms', [])
-        tone = data.get('tone', 'professional')
-        include_hashtags = data.get('include_hashtags', True)
-        include_emojis = data.get('include_emojis', True)
-        call_to_action = data.get('call_to_action', False)
-        target_audience = data.get('target_audience')
-        key_points = data.get('key_points', [])
-
-        if not transcription_id:
-            return jsonify({'error': 'transcription_id is required'}), 400
-
-        # Fetch transcription content from storage
-        transcription = whisper_service.get_transcription(transcription_id)
-        if not transcription:
-            return jsonify({'error': 'Transcription not found'}), 404
-        
-        transcription_text = transcription.get('text', '')
-        if not transcription_text:
-            return jsonify({'error': 'No transcription text found'}), 400
-
-        # Import the post generator
-        from services.text_generation.post_generator import post_generator, PostTone, PostGenerationConfig
-        
-        # Convert tone string to enum
-        try:
-            tone_enum = PostTone(tone.lower())
-        except ValueError:
-            logger.warning(f"Invalid tone '{tone}', using professional")
-            tone_enum = PostTone.PROFESSIONAL
-        
-        posts = {}
-        generation_metadata = {}
-        
-        for platform in platforms:
-            try:
-                # Create platform-specific config
-                config = PostGenerationConfig(
-                    tone=tone_enum,
-                    max_length=280 if platform == 'twitter' else 500,
-                    include_hashtags=include_hashtags,
-                    include_emojis=include_emojis,
-                    call_to_action=call_to_action,
-                    target_audience=target_audience,
-                    key_points=key_points if key_points else None,
-                    generation_timeout=30
-                )
-                
-                # Generate post with timeout protection
-                result = run_sync_in_worker(
-                    lambda: post_generator.generate_post(transcription_text, config),
-                    description="post-generation"
-                )
-                
-                if result['status'] == 'success':
-                    posts[platform] = result['post']
-                    generation_metadata[platform] = {
-                        'generation_time': result['generation_time'],
-                        'word_count': result['word_count'],
-                        'character_count': result['character_count'],
-                        'tone': result['tone']
-                    }
-                else:
-                    logger.error(f"Failed to generate post for {platform}: {result.get('error', 'Unknown error')}")
-                    posts[platform] = f"Error: {result.get('error', 'Generation failed')}"
-                    
-            except Exception as e:
-                logger.error(f"Error generating post for {platform}: {e}")
-                posts[platform] = f"Error: {str(e)}"
-
-        # Save generated posts
-        post_id = post_storage.save_post(
-            transcription_id=transcription_id,
-            platforms=platforms,
-            tone=tone,
-            posts=posts,
-            generation_metadata=generation_metadata
-        )
+    data = _body()
+
+    transcription_id = data.get('transcription_id')
+    platforms = data.get('platforms', [])
+    tone = data.get('tone', 'professional')
+    include_hashtags = data.get('include_hashtags', True)
+    include_emojis = data.get('include_emojis', True)
+    call_to_action = data.get('call_to_action', False)
+    target_audience = data.get('target_audience')
+    key_points = data.get('key_points', [])
+
+    if not transcription_id:
+        return jsonify({'error': 'transcription_id is required'}), 400
+
+    # Fetch transcription content from storage
+    transcription = whisper_service.get_transcription(transcription_id)
+    if not transcription:
+        return jsonify({'error': 'Transcription not found'}), 404
+    
+    transcription_text = transcription.get('text', '')
+    if not transcription_text:
+        return jsonify({'error': 'No transcription text found'}), 400
+
+    # Convert tone string to enum
+    tone_enum = TONES.get(tone.lower())
+    if tone_enum is None:
+        logger.warning(f"Invalid tone '{tone}', using professional")
+        tone_enum = PostTone.PROFESSIONAL
+    
+    posts = {}
+    generation_metadata = {}
+    
+    # Platform-specific greedy configs, generated together in one batched call
+    configs = platform_configs(
+        platforms,
+        tone=tone_enum,
+        include_hashtags=include_hashtags,
+        include_emojis=include_emojis,
+        call_to_action=call_to_action,
+        target_audience=target_audience,
+        key_points=key_points if key_points else None,
+        generation_timeout=30
+    )
+    
+    if flan_t5_service.device == 'cuda':
+        # One padded generate call; the generator applies its own timeout
+        results = post_generator.generate_posts_batch(transcription_text, configs)
+    else:
+        # Padding buys little on CPU, so spread the platforms across idle pool workers;
+        # single greedy generations also hit FLAN-T5's own prompt-level cache
+        futures = [
+            _worker_manager.submit_job(
+                functools.partial(post_generator.generate_post, transcription_text, config),
+                description=f"post-generation-{config.platform}"
+            )
+            for config in configs
+        ]
+        results = [future.result() for future in futures]
+    
+    for platform, result in zip(platforms, results):
+        if result['status'] == 'success':
+            posts[platform] = result['post']
+            generation_metadata[platform] = {
+                'generation_time': result['generation_time'],
+                'word_count': result['word_count'],
+                'character_count': result['character_count'],
+                'tone': result['tone']
+            }
+        else:
+            logger.error(f"Failed to generate post for {platform}: {result.get('error', 'Unknown error')}")
+            posts[platform] = f"Error: {result.get('error', 'Generation failed')}"
+
+    # Save generated posts
+    post_id = post_storage.save_post(
+        transcription_id=transcription_id,
+        platforms=platforms,
+        tone=tone,
+        posts=posts,
+        generation_metadata=generation_metadata
+    )
 
-        return jsonify({
-            'post_id': post_id,
-            'posts': posts,
-            'metadata': generation_metadata,
-            'status': 'completed',
-            'available_tones': [t.value for t in PostTone]
-        }), 200
+    return jsonify({
+        'post_id': post_id,
+        'posts': posts,
+        'metadata': generation_metadata,
+        'status': 'completed',
+        'available_tones': [t.value for t in PostTone]
+    }), 200
 
-    except Exception as e:
-        logger.error(f"Error in generate_posts endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/regenerate-post', methods=['POST'])
 def regenerate_post():
     """Regenerate specific post with different tone"""
-    try:
-        data = request.get_json()
-
-        transcription_id = data.get('transcription_id')
-        platform = data.get('platform')
-        tone = data.get('tone', 'professional')
-
-        if not transcription_id or not platform:
-            return jsonify({'error': 'Both transcription_id and platform are required'}), 400
-
-        # Fetch transcription content from storage
-        transcription = whisper_service.get_transcription(transcription_id)
-        if not transcription:
-            return jsonify({'error': 'Transcription not found'}), 404
-        
-        transcription_text = transcription.get('text', '')
-        if not transcription_text:
-            return jsonify({'error': 'No transcription text found'}), 400
-
-        # Optimize prompt
-        prompt = get_template(platform, tone).format(content=transcription_text)
-        
-        # Generate text using FLAN-T5
-        result = run_sync_in_worker(lambda: flan_t5_service.generate_text(prompt), description="flan-generate")
-        generated_text = result.get('text')
-
-        # Process content
-        processor = ContentProcessor()
-        formatted_text = processor.format_for_platform(generated_text, platform)
-
-        # Update post
-        post_updated = post_storage.update_post(
-            post_id=transcription_id,  # Using transcription_id as mock post_id for updating purposes
-            platform=platform,
-            new_content=formatted_text
-        )
+    data = _body()
+
+    transcription_id = data.get('transcription_id')
+    platform = data.get('platform')
+    tone = data.get('tone', 'professional')
+
+    if not transcription_id or not platform:
+        return jsonify({'error': 'Both transcription_id and platform are required'}), 400
+
+    # Fetch transcription content from storage
+    transcription = whisper_service.get_transcription(transcription_id)
+    if not transcription:
+        return jsonify({'error': 'Transcription not found'}), 404
+    
+    transcription_text = transcription.get('text', '')
+    if not transcription_text:
+        return jsonify({'error': 'No transcription text found'}), 400
+
+    # Optimize prompt
+    prompt = get_formatter(platform, tone)(content=transcription_text)
+    
+    # Generate text using FLAN-T5
+    result = flan_t5_service.generate_text(prompt)
+    generated_text = result.get('text')
+
+    # Process content
+    formatted_text = content_processor.format_for_platform(generated_text, platform)
+
+    # Update post
+    post_updated = post_storage.update_post(
+        post_id=transcription_id,  # Using transcription_id as mock post_id for updating purposes
+        platform=platform,
+        new_content=formatted_text
+    )
+
+    if not post_updated:
+        return jsonify({'error': 'Failed to update post content'}), 500
 
-        if not post_updated:
-            return jsonify({'error': 'Failed to update post content'}), 500
-
-        return jsonify({
-            'post': formatted_text,
-            'status': 'completed'
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error in regenerate_post endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return jsonify({
+        'post': formatted_text,
+        'status': 'completed'
+    }), 200
 
 
 @app.route('/api/posts/<post_id>', methods=['GET'])
 def get_generated_posts(post_id):
     """Retrieve generated posts"""
-    try:
-        post = post_storage.get_post(post_id)
-        if not post:
-            return jsonify({'error': 'Post not found'}), 404
+    post = post_storage.get_post(post_id)
+    if not post:
+        return jsonify({'error': 'Post not found'}), 404
 
-        return jsonify({
-            'posts': post.get('posts', {}),
-            'metadata': post.get('metadata', {})
-        }), 200
+    return jsonify({
+        'posts': post.get('posts', {}),
+        'metadata': post.get('metadata', {})
+    }), 200
 
-    except Exception as e:
-        logger.error(f"Error retrieving posts for {post_id}: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/tones', methods=['GET'])
 def get_available_tones():
     """Get available post generation tones"""
-    try:
-        from services.text_generation.post_generator import PostTone
-        
-        tones = [{
-            'value': tone.value,
-            'name': tone.value.title().replace('_', ' '),
-            'description': {
-                'witty': 'Clever and humorous posts with wordplay and smart observations',
-                'professional': 'Clear, authoritative posts focused on key insights',
-                'motivational': 'Inspiring and uplifting content that encourages action',
-                'casual': 'Friendly, conversational posts that feel relatable',
-                'educational': 'Informative content focused on teaching and explaining',
-                'humorous': 'Funny and entertaining posts designed to make people smile',
-                'inspirational': 'Hope-focused content about dreams and positive transformation',
-                'urgent': 'Action-oriented posts that create a sense of immediacy'
-            }.get(tone.value, f'Posts with {tone.value} tone')
-        } for tone in PostTone]
-        
-        return jsonify({
-            'tones': tones,
-            'default': 'professional'
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting available tones: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return app.response_class(TONES_RESPONSE_BODY, status=200, mimetype=app.json.mimetype)
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Log unhandled route errors once and return a generic 500"""
+    # Let Flask render HTTP errors (404, 405, 429 from the rate limiter, ...)
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception(f"Unhandled error in {request.method} {request.path}")
+    return jsonify({
+        'success': False,
+        'error': 'Internal server error'
+    }), 500
 
 # ---------------------------------------------------------------------------
 # Production security & monitoring middleware (initialised **after** routes)
@@ -501,9 +585,10 @@ init_security_headers(app)
 init_rate_limiter(app)
 register_middleware(app)
 
-# Performance response optimisation (gzip, keep-alive)
-from performance.response_optimizer import init_response_optimizer  # noqa: E402
+# Performance response optimisation (Brotli/gzip, keep-alive)
+from performance.response_optimizer import init_response_optimizer, init_compression  # noqa: E402
 init_response_optimizer(app)
+init_compression(app)
 
 if __name__ == '__main__':
     app.run(debug=os.getenv('FLASK_ENV') != 'production', host='0.0.0.0', port=5000)
@@ -1,20 +1,53 @@
 """Structured JSON logging configuration."""
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import logging.handlers
 import os
+import queue
 from logging.config import dictConfig
-from typing import Mapping
+from typing import Any, Mapping, Optional
+
+import orjson
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "app.log")
 
+
+def _orjson_dumps(obj: Any, default: Any = None, **_: Any) -> str:
+    """``json.dumps`` stand-in for JsonFormatter; extra keyword options are ignored.
+
+    Values orjson cannot serialise natively (sets, arbitrary objects in
+    ``extra``) fall back to ``str`` instead of dropping the record.
+    """
+    return orjson.dumps(obj, default=default or str).decode()
+
+
 DEFAULT_FORMAT = {
     "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
     "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+    "json_serializer": _orjson_dumps,
 }
 
+# Formats and writes records queued by the root logger's QueueHandler
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unformatted.
+
+    The stock ``prepare`` formats the message and traceback on the calling
+    thread and folds ``exc_info`` into ``message``; here args and exc_info are
+    kept so the listener's JSON formatter does that work and still emits
+    ``exc_info`` as its own field.  The queue is in-process, so nothing has to
+    be made picklable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 def setup_logger() -> None:
     """Configure the root logger with JSON output and rotation."""
@@ -49,4 +82,32 @@ def setup_logger() -> None:
             "level": LOG_LEVEL,
         },
     }
+    # Flush any previous listener before dictConfig closes its handlers
+    _stop_listener()
     dictConfig(config)  # type: ignore[arg-type]
+    _start_listener()
+
+
+def _start_listener() -> None:
+    """Hand the root handlers to a background listener so log calls only enqueue."""
+    global _listener
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Drain queued records and stop the listener thread, if running."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -6,16 +6,25 @@ from pydub.utils import which
 
 logger = logging.getLogger(__name__)
 
+# Common Windows install locations, checked before PATH
+FFMPEG_CANDIDATES = (
+    r"C:\ffmpeg\bin\ffmpeg.exe",
+    r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+    r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
+)
+
+# Set once the codec paths have been resolved; later calls return immediately
+_configured = False
+
 def configure_audio_processing():
     """Configure audio processing with proper codec paths."""
+    global _configured
+    if _configured:
+        return
+    
     try:
         # Try to find ffmpeg in common locations
-        possible_paths = [
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
-            which("ffmpeg")
-        ]
+        possible_paths = FFMPEG_CANDIDATES + (which("ffmpeg"),)
         
         ffmpeg_path = None
         for path in possible_paths:
@@ -30,6 +39,7 @@ def configure_audio_processing():
             logger.info(f"FFmpeg configured at: {ffmpeg_path}")
         else:
             logger.warning("FFmpeg not found. Audio processing may be limited.")
+        _configured = True
             
     except Exception as e:
         logger.error(f"Error configuring audio processing: {e}")
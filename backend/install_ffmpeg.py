@@ -4,19 +4,70 @@ FFmpeg installer for Windows
 This script downloads and installs FFmpeg for Windows systems
 """
 
+import hashlib
 import os
 import sys
-import urllib.request
 import zipfile
 import tempfile
 import shutil
 import logging
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Archive members needed for audio processing; the rest of the build is skipped
+FFMPEG_BINARIES = ("/bin/ffmpeg.exe", "/bin/ffprobe.exe")
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+DOWNLOAD_ATTEMPTS = 5
+
+# gyan.dev publishes the SHA-256 of each build next to the archive
+FFMPEG_URL = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
+FFMPEG_SHA256_URL = FFMPEG_URL + ".sha256"
+
+def download_file(url, path, checksum_url=None):
+    """Stream *url* to *path*, resuming dropped transfers, and verify the published SHA-256."""
+    path = Path(path)
+    session = requests.Session()
+    retry = Retry(total=5, backoff_factor=1.5, status_forcelist=(502, 503, 504))
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        # Continue from whatever an interrupted attempt (or earlier run) left on disk
+        offset = path.stat().st_size if path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 416:  # Nothing left to fetch
+                    break
+                response.raise_for_status()
+                mode = 'ab' if response.status_code == 206 else 'wb'
+                with open(path, mode) as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == DOWNLOAD_ATTEMPTS - 1:
+                raise
+            logger.warning(f"Download interrupted ({e}), resuming")
+    
+    if checksum_url:
+        expected = session.get(checksum_url, timeout=30).text.split()[0].lower()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        if digest.hexdigest() != expected:
+            path.unlink()
+            raise ValueError(f"Checksum mismatch for {url}")
+    
+    return path
+
 def install_ffmpeg():
     """Install FFmpeg on Windows system"""
     try:
@@ -27,9 +78,6 @@ def install_ffmpeg():
         
         logger.info("Installing FFmpeg for Windows...")
         
-        # FFmpeg Windows build URL (official release)
-        ffmpeg_url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
-        
         # Create temporary directory
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
@@ -37,12 +85,14 @@ def install_ffmpeg():
             
             # Download FFmpeg
             logger.info("Downloading FFmpeg...")
-            urllib.request.urlretrieve(ffmpeg_url, zip_path)
+            download_file(FFMPEG_URL, zip_path, checksum_url=FFMPEG_SHA256_URL)
             
-            # Extract the zip file
+            # Extract only the binaries from the zip file
             logger.info("Extracting FFmpeg...")
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_path)
+                for info in zip_ref.infolist():
+                    if info.filename.endswith(FFMPEG_BINARIES):
+                        zip_ref.extract(info, temp_path)
             
             # Find the extracted directory
             extracted_dirs = [d for d in temp_path.iterdir() if d.is_dir() and d.name.startswith('ffmpeg')]
@@ -56,9 +106,9 @@ def install_ffmpeg():
             if install_dir.exists():
                 shutil.rmtree(install_dir)
             
-            # Copy FFmpeg to installation directory
+            # Move FFmpeg to installation directory (a rename on the same volume)
             logger.info(f"Installing FFmpeg to {install_dir}")
-            shutil.copytree(ffmpeg_dir, install_dir)
+            shutil.move(str(ffmpeg_dir), str(install_dir))
             
             # Add to PATH
             bin_dir = install_dir / "bin"
@@ -7,12 +7,13 @@ Downloads and configures FFmpeg for audio processing
 import os
 import sys
 import subprocess
-import urllib.request
 import zipfile
 import shutil
 from pathlib import Path
 import winreg
 
+from install_ffmpeg import FFMPEG_BINARIES, FFMPEG_SHA256_URL, FFMPEG_URL, download_file
+
 def check_ffmpeg_installed():
     """Check if FFmpeg is already installed and accessible."""
     try:
@@ -31,13 +32,11 @@ def download_ffmpeg():
     """Download FFmpeg for Windows."""
     print("Downloading FFmpeg for Windows...")
     
-    # FFmpeg download URL (static build)
-    ffmpeg_url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
     download_path = Path("ffmpeg-release-essentials.zip")
     
     try:
-        print(f"Downloading from: {ffmpeg_url}")
-        urllib.request.urlretrieve(ffmpeg_url, download_path)
+        print(f"Downloading from: {FFMPEG_URL}")
+        download_file(FFMPEG_URL, download_path, checksum_url=FFMPEG_SHA256_URL)
         print(f"✓ Downloaded FFmpeg to: {download_path}")
         return download_path
     except Exception as e:
@@ -52,7 +51,9 @@ def extract_ffmpeg(zip_path):
     
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+            for info in zip_ref.infolist():
+                if info.filename.endswith(FFMPEG_BINARIES):
+                    zip_ref.extract(info, extract_dir)
         
         # Find the extracted folder (it has a version number)
         extracted_folders = list(extract_dir.glob("ffmpeg-*"))
@@ -76,12 +77,14 @@ def install_ffmpeg_locally(ffmpeg_folder):
     local_ffmpeg_dir.mkdir(exist_ok=True)
     
     try:
-        # Copy ffmpeg binaries
+        # Move ffmpeg binaries (a rename on the same volume, a copy across drives)
         bin_source = ffmpeg_folder / "bin"
         bin_dest = local_ffmpeg_dir / "bin"
         
         if bin_source.exists():
-            shutil.copytree(bin_source, bin_dest, dirs_exist_ok=True)
+            if bin_dest.exists():
+                shutil.rmtree(bin_dest)
+            shutil.move(str(bin_source), str(bin_dest))
             print(f"✓ FFmpeg binaries installed to: {bin_dest}")
             
             # Make sure ffmpeg.exe exists
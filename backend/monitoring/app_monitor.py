@@ -2,42 +2,66 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from statistics import mean
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Number of most recent durations kept for percentile reporting
+RECENT_WINDOW = 1024
+
 
 class MetricStore:
-    """In-memory store for simple time-series metrics."""
+    """In-memory store for simple time-series metrics, safe to update from request threads."""
 
     def __init__(self) -> None:
-        self.response_times: List[float] = []
+        # Running totals keep the average O(1); only a bounded window is retained
+        self.response_time_total: float = 0.0
+        self.recent_response_times: Deque[float] = deque(maxlen=RECENT_WINDOW)
         self.errors: int = 0
         self.request_count: int = 0
+        self._lock = threading.Lock()
 
     # ---------------------------------------------------------------------
     # API
     # ---------------------------------------------------------------------
 
     def record_request(self, duration: float, *, error: bool) -> None:
-        self.request_count += 1
-        self.response_times.append(duration)
-        if error:
-            self.errors += 1
+        with self._lock:
+            self.request_count += 1
+            self.response_time_total += duration
+            self.recent_response_times.append(duration)
+            if error:
+                self.errors += 1
 
     # ------------------------- Exposed metrics ---------------------------
 
     @property
     def avg_response_ms(self) -> float:
-        return mean(self.response_times) * 1000 if self.response_times else 0.0
+        with self._lock:
+            if self.request_count == 0:
+                return 0.0
+            return self.response_time_total / self.request_count * 1000
+
+    def percentile_ms(self, q: float) -> float:
+        """Return the *q*-th percentile (0-100) of the recent response times in ms."""
+        with self._lock:
+            window = np.array(self.recent_response_times, dtype=np.float64)
+        if not len(window):
+            return 0.0
+        k = min(int(len(window) * q / 100), len(window) - 1)
+        return float(np.partition(window, k)[k]) * 1000
 
     @property
     def error_rate(self) -> float:
-        if self.request_count == 0:
-            return 0.0
-        return self.errors / self.request_count
+        with self._lock:
+            if self.request_count == 0:
+                return 0.0
+            return self.errors / self.request_count
 
 
 metric_store = MetricStore()
@@ -50,26 +74,20 @@ metric_store = MetricStore()
 
 def register_middleware(app):  # noqa: D401
     """Attach before/after request hooks to *app* for automatic metrics."""
+    from flask import g
+
+    perf_counter = time.perf_counter
 
     @app.before_request
     def _start_timer():  # noqa: D401, WPS430
-        # type: ignore[unused-variable]
-        request_ctx = getattr(app, "_request_ctx_stack", None)
-        if request_ctx:  # pragma: no cover – Flask <2.3
-            request_ctx.top.start_time = time.perf_counter()
-        else:
-            from flask import g
-
-            g.start_time = time.perf_counter()
+        g.start_time = perf_counter()
 
     @app.after_request
     def _record_metrics(response):  # noqa: D401
-        from flask import g, request
-
-        start_time = getattr(g, "start_time", None)
+        start_time = g.get("start_time")
         if start_time is None:
             return response
-        duration = time.perf_counter() - start_time
+        duration = perf_counter() - start_time
         metric_store.record_request(duration, error=response.status_code >= 500)
         # Attach Server-Timing header for easy client-side inspection
         response.headers["Server-Timing"] = f"app;dur={duration * 1000:.2f}"  # ms
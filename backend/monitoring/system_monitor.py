@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import os
 import platform
+import shutil
+import threading
 import time
 from dataclasses import asdict, dataclass
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple
 
 import psutil
 
@@ -26,36 +28,104 @@ class SystemMetrics:
         return asdict(self)
 
 
-_prev_net = psutil.net_io_counters()
-_prev_time = time.time()
+_MB = 1.0 / (1 << 20)
+_GB = 1.0 / (1 << 30)
+
+@dataclass(frozen=True)
+class _NetSample:
+    """Network counters and the monotonic time they were read at."""
+
+    counters: Any
+    taken_at: float
+
+
+# Guards the previous network sample and the last metrics computed from it
+_capture_lock = threading.Lock()
+_prev_sample = _NetSample(psutil.net_io_counters(), time.monotonic())
+_last_metrics: Optional[SystemMetrics] = None
+
+# Prime psutil's CPU counter so later non-blocking reads report the delta
+psutil.cpu_percent(interval=None)
+
+# Enumerating pids walks /proc, so the count is refreshed at most this often
+PROCESS_COUNT_TTL = 30  # seconds
+_process_count: Tuple[float, int] = (0.0, 0)
+
+# Health endpoints are polled frequently; snapshots younger than this are reused
+SNAPSHOT_TTL = float(os.getenv("HEALTH_SNAPSHOT_TTL", "5"))  # seconds
+
+_snapshot_lock = threading.Lock()
+_metrics_snapshot: Tuple[float, SystemMetrics | None] = (0.0, None)
+_disk_snapshots: Dict[str, Tuple[float, Tuple[int, int, int]]] = {}
+
+
+def _count_processes() -> int:
+    """Count running processes; on Linux, read /proc dirents without building a pid list."""
+    try:
+        with os.scandir("/proc") as entries:
+            return sum(1 for entry in entries if entry.name.isdigit())
+    except OSError:
+        return len(psutil.pids())
 
 
 def capture_metrics() -> SystemMetrics:  # noqa: D401
-    global _prev_net, _prev_time
-
-    cpu = psutil.cpu_percent(interval=0.1)
-    mem = psutil.virtual_memory()
-    load1, _, _ = psutil.getloadavg()
-    disk = psutil.disk_usage("/")
-    net = psutil.net_io_counters()
-
-    now = time.time()
-    elapsed = now - _prev_time if now > _prev_time else 1
-
-    sent_mb = (net.bytes_sent - _prev_net.bytes_sent) / 1024 ** 2 / elapsed
-    recv_mb = (net.bytes_recv - _prev_net.bytes_recv) / 1024 ** 2 / elapsed
-
-    _prev_net = net
-    _prev_time = now
-
-    return SystemMetrics(
-        cpu_percent=cpu,
-        memory_total_mb=int(mem.total / 1024 ** 2),
-        memory_used_mb=int(mem.used / 1024 ** 2),
-        load_average_1m=load1,
-        disk_total_gb=disk.total / 1024 ** 3,
-        disk_used_gb=disk.used / 1024 ** 3,
-        bandwidth_sent_mb=sent_mb,
-        bandwidth_recv_mb=recv_mb,
-        process_count=len(psutil.pids()),
-    )
+    global _prev_sample, _last_metrics, _process_count
+
+    with _capture_lock:
+        sample = _NetSample(psutil.net_io_counters(), time.monotonic())
+        elapsed = sample.taken_at - _prev_sample.taken_at
+        if elapsed <= 0 and _last_metrics is not None:
+            # No time has passed since the last reading, so there is no new rate
+            return _last_metrics
+
+        cpu = psutil.cpu_percent(interval=None)
+        mem = psutil.virtual_memory()
+        load1, _, _ = psutil.getloadavg()
+        disk = psutil.disk_usage("/")
+
+        if elapsed > 0:
+            sent_mb = (sample.counters.bytes_sent - _prev_sample.counters.bytes_sent) * _MB / elapsed
+            recv_mb = (sample.counters.bytes_recv - _prev_sample.counters.bytes_recv) * _MB / elapsed
+        else:
+            sent_mb = recv_mb = 0.0
+        _prev_sample = sample
+
+        counted_at, process_count = _process_count
+        if sample.taken_at - counted_at > PROCESS_COUNT_TTL:
+            process_count = _count_processes()
+            _process_count = (sample.taken_at, process_count)
+
+        _last_metrics = SystemMetrics(
+            cpu_percent=cpu,
+            memory_total_mb=mem.total >> 20,
+            memory_used_mb=mem.used >> 20,
+            load_average_1m=load1,
+            disk_total_gb=disk.total * _GB,
+            disk_used_gb=disk.used * _GB,
+            bandwidth_sent_mb=sent_mb,
+            bandwidth_recv_mb=recv_mb,
+            process_count=process_count,
+        )
+        return _last_metrics
+
+
+def cached_metrics(ttl: float = SNAPSHOT_TTL) -> SystemMetrics:
+    """Return :func:`capture_metrics`, reusing a snapshot taken within *ttl* seconds."""
+    global _metrics_snapshot
+
+    with _snapshot_lock:
+        taken_at, metrics = _metrics_snapshot
+        if metrics is None or time.monotonic() - taken_at > ttl:
+            metrics = capture_metrics()
+            _metrics_snapshot = (time.monotonic(), metrics)
+        return metrics
+
+
+def cached_disk_usage(path: str, ttl: float = SNAPSHOT_TTL) -> Tuple[int, int, int]:
+    """Return ``shutil.disk_usage(path)`` as (total, used, free), cached for *ttl* seconds."""
+    with _snapshot_lock:
+        taken_at, usage = _disk_snapshots.get(path, (0.0, None))
+        if usage is None or time.monotonic() - taken_at > ttl:
+            usage = tuple(shutil.disk_usage(path))
+            _disk_snapshots[path] = (time.monotonic(), usage)
+        return usage
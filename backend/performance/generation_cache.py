@@ -0,0 +1,62 @@
+"""In-process, content-addressed cache for generated text.
+
+Keys are BLAKE2b digests of the model input, so identical prompts (demo
+traffic, client retries) skip FLAN-T5 entirely.  Entries expire after a TTL
+and the least recently used entry is evicted once ``maxsize`` is reached.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+DEFAULT_TTL = int(os.getenv("GENERATION_CACHE_TTL", "86400"))  # seconds
+DEFAULT_MAXSIZE = int(os.getenv("GENERATION_CACHE_SIZE", "1024"))
+
+
+def cache_key(*parts: object) -> str:
+    """Return a 128-bit BLAKE2b hex digest of *parts*."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class GenerationCache:
+    """Thread-safe LRU mapping of key → text with per-entry expiry."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance used by the post generator
+generation_cache = GenerationCache()
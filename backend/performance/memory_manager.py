@@ -29,6 +29,10 @@ class MemoryThresholds:
     critical: int = int(os.getenv("MEMORY_CRIT_THRESHOLD_MB", "2048"))  # 2 GiB
 
 
+# Registered models unused for this long may be evicted by aggressive_cleanup
+MODEL_IDLE_TIMEOUT = float(os.getenv("MODEL_IDLE_TIMEOUT", "300"))  # seconds
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -48,25 +52,26 @@ class MemoryManager(threading.Thread):
         self.interval = interval
         self.cleanup_callback = cleanup_callback or gc.collect
         self._stop = threading.Event()
+        self._proc = psutil.Process(os.getpid())
 
     @property
     def memory_mb(self) -> int:
-        proc = psutil.Process(os.getpid())
-        return int(proc.memory_info().rss / 1024 ** 2)
+        return self._proc.memory_info().rss >> 20
 
     def aggressive_cleanup(self):
         """Perform aggressive memory cleanup"""
         try:
-            # Force multiple garbage collections
-            for _ in range(3):
-                gc.collect()
+            # Evict registered models left idle; busy ones stay resident
+            unload_unused_models(set(), idle_for=MODEL_IDLE_TIMEOUT)
             
-            # Clean up torch cache if available
+            # One full collection; frozen model weights are skipped (see freeze_resident_objects)
+            gc.collect()
+            
+            # Return blocks freed by the collection to the CUDA driver
             try:
                 import torch
                 if torch.cuda.is_available():
                     torch.cuda.empty_cache()
-                    torch.cuda.synchronize()
             except ImportError:
                 pass
             
@@ -102,21 +107,55 @@ class MemoryManager(threading.Thread):
         self._stop.set()
 
 
-# Registry of loaded models (name -> unload callable)
+# Registry of loaded models (name -> unload callable) and their last use (monotonic)
 _LOADED_MODELS: Dict[str, Callable[[], None]] = {}
+_LAST_USED: Dict[str, float] = {}
+# Re-entrant so an unload callback may itself (re-)register a model
+_REG_LOCK = threading.RLock()
 
 
 def register_model(name: str, unload_fn: Callable[[], None]) -> None:
     """Register a model *name* alongside an *unload_fn* for later unloading."""
-    _LOADED_MODELS[name] = unload_fn
-
-
-def unload_unused_models(active: set[str]) -> None:
-    """Unload any models that are not currently *active* to save memory."""
-    for name in list(_LOADED_MODELS):
-        if name not in active:
-            try:
-                _LOADED_MODELS.pop(name)()
-                logger.info("Unloaded model '%s' to free memory", name)
-            except Exception as exc:  # pragma: no cover
-                logger.exception("Failed to unload model %s: %s", name, exc)
+    with _REG_LOCK:
+        _LOADED_MODELS[name] = unload_fn
+        _LAST_USED[name] = time.monotonic()
+
+
+def touch_model(name: str) -> None:
+    """Record that the registered model *name* is being used now."""
+    with _REG_LOCK:
+        if name in _LOADED_MODELS:
+            _LAST_USED[name] = time.monotonic()
+
+
+def unload_unused_models(active: set[str], idle_for: float | None = None) -> None:
+    """Unload any models that are not currently *active* to save memory.
+
+    With *idle_for*, only models unused for at least that many seconds are unloaded.
+    """
+    # Claim the entries under the lock, then run the callbacks outside it
+    with _REG_LOCK:
+        now = time.monotonic()
+        unused = [
+            (name, _LOADED_MODELS.pop(name))
+            for name in tuple(_LOADED_MODELS)
+            if name not in active and (idle_for is None or now - _LAST_USED[name] >= idle_for)
+        ]
+        for name, _ in unused:
+            del _LAST_USED[name]
+    for name, unload_fn in unused:
+        try:
+            unload_fn()
+            logger.info("Unloaded model '%s' to free memory", name)
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Failed to unload model %s: %s", name, exc)
+
+def freeze_resident_objects() -> None:
+    """Move everything alive now (e.g. loaded model weights) out of the GC's reach.
+
+    Call once after startup loading so later collections only scan objects
+    allocated per request.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info("Froze %s long-lived objects", gc.get_freeze_count())
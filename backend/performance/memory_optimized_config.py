@@ -6,25 +6,39 @@ import gc
 import logging
 import psutil
 import os
+import time
 from contextlib import contextmanager
 
+from performance.memory_manager import MemoryThresholds
+
 logger = logging.getLogger(__name__)
 
+# Back-to-back RSS reads within this window reuse the previous sample
+MEMORY_SAMPLE_TTL = 0.1  # seconds
+
 class MemoryOptimizer:
     """Optimize memory usage for AI model operations."""
     
-    def __init__(self):
+    def __init__(self, threshold_mb=None):
         self.process = psutil.Process(os.getpid())
+        # Full collections only run once RSS passes the memory warning threshold
+        self._threshold_mb = threshold_mb if threshold_mb is not None else MemoryThresholds().warning
+        self._rss_sample = (float("-inf"), 0.0)
     
     def get_memory_usage(self):
-        """Get current memory usage in MB."""
-        return self.process.memory_info().rss / 1024 / 1024
+        """Get current memory usage in MB, re-read at most every MEMORY_SAMPLE_TTL seconds."""
+        now = time.monotonic()
+        taken_at, usage = self._rss_sample
+        if now - taken_at > MEMORY_SAMPLE_TTL:
+            usage = self.process.memory_info().rss / 1024 / 1024
+            self._rss_sample = (now, usage)
+        return usage
     
     def force_garbage_collection(self):
-        """Force aggressive garbage collection."""
-        collected = 0
-        for i in range(3):
-            collected += gc.collect()
+        """Run a full garbage collection if memory usage is above the threshold."""
+        if self.get_memory_usage() <= self._threshold_mb:
+            return 0
+        collected = gc.collect(2)
         logger.info(f"Garbage collection freed {collected} objects")
         return collected
     
@@ -53,19 +67,17 @@ class MemoryOptimizer:
     @contextmanager
     def memory_managed_operation(self, operation_name="operation"):
         """Context manager for memory-managed operations."""
-        logger.info(f"[MEMORY] Starting {operation_name}")
+        logger.debug("[MEMORY] Starting %s", operation_name)
         start_memory = self.get_memory_usage()
         
         try:
-            # Optimize before operation
-            self.force_garbage_collection()
             yield
         finally:
-            # Clean up after operation
+            # Collects only under memory pressure; refcounting frees the rest
             self.force_garbage_collection()
             end_memory = self.get_memory_usage()
             memory_delta = end_memory - start_memory
-            logger.info(f"[MEMORY] {operation_name} completed. Memory delta: {memory_delta:+.1f}MB")
+            logger.debug("[MEMORY] %s completed. Memory delta: %+.1fMB", operation_name, memory_delta)
 
 # Global memory optimizer instance
 memory_optimizer = MemoryOptimizer()
@@ -1,33 +1,149 @@
-"""Model optimisation helpers – quantisation, warm-up, caching."""
+"""Model optimisation helpers – quantisation, compilation, warm-up, caching."""
 from __future__ import annotations
 
 import logging
+import os
 import time
 from functools import lru_cache
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Sequence
 
 import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, BitsAndBytesConfig
+
+from performance.memory_manager import register_model, touch_model
 
 logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=4)
+# bitsandbytes LLM.int8(): activations above this magnitude stay in fp16
+INT8_THRESHOLD = 6.0
+
+# "bnb" (int8 weights), "ort" (ONNX Runtime int8 via optimum) or "compile" (torch.compile)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "bnb")
+ORT_CACHE_DIR = Path(os.getenv("ORT_CACHE_DIR", "models/onnx"))
+
+
+def _load_ort_model(model_name: str):
+    """Export *model_name* to ONNX once, quantise it to dynamic int8 and load it in ONNX Runtime."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    export_dir = ORT_CACHE_DIR / model_name.replace("/", "--")
+    quantized_dir = export_dir / "int8"
+    if not quantized_dir.exists():
+        logger.info("Exporting %s to ONNX in %s", model_name, export_dir)
+        ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+        # VNNI int8 matmuls; falls back to plain int8 kernels on CPUs without them
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        for onnx_file in sorted(export_dir.glob("*.onnx")):
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        quantized_dir,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+    )
+
+
 def load_quantised_model(model_name: str):  # noqa: D401
-    """Load *model_name* in 8-bit quantised form to save memory & improve speed."""
-    logger.info("Loading quantised model %s", model_name)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, load_in_8bit=True, device_map="auto")
+    """Load *model_name* for fast inference with the configured ``INFERENCE_BACKEND``.
+
+    ``bnb`` uses bitsandbytes int8 weights on CUDA and dynamic int8 ``Linear``
+    layers on CPU, where bitsandbytes is unavailable.  ``ort`` runs an int8
+    ONNX export in ONNX Runtime (needs ``optimum[onnxruntime]``).  ``compile``
+    keeps full-precision weights and compiles the forward pass instead.
+
+    The loaded pair is cached; each call marks it as recently used.
+    """
+    model_and_tokenizer = _load_quantised_model(model_name)
+    touch_model(f"quantised:{model_name}")
+    return model_and_tokenizer
+
+
+@lru_cache(maxsize=1)
+def _load_quantised_model(model_name: str):
+    if INFERENCE_BACKEND == "ort":
+        logger.info("Loading quantised model %s (ONNX Runtime int8)", model_name)
+        model = _load_ort_model(model_name)
+    elif INFERENCE_BACKEND == "compile":
+        logger.info("Loading compiled model %s", model_name)
+        if torch.cuda.is_available():
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.float16).to("cuda")
+        else:
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.float32)
+        compile_for_generation(model.eval())
+    elif torch.cuda.is_available():
+        logger.info("Loading quantised model %s (bitsandbytes int8)", model_name)
+        bnb = BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=INT8_THRESHOLD)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, quantization_config=bnb, device_map="auto")
+    else:
+        logger.info("Loading quantised model %s (dynamic int8, CPU)", model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.float32)
+        model = torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
     tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # Lets the memory manager drop the cached model under memory pressure
+    register_model(f"quantised:{model_name}", evict_quantised_model)
     return model, tokenizer
 
 
-def warm_up(model, tokenizer: Callable[[str, bool], object], *, prompt: str = "hello", n: int = 3):  # noqa: D401
-    """Run quick dummy inference to compile kernels & fill caches."""
+def evict_quantised_model() -> None:
+    """Drop the model cached by :func:`load_quantised_model` and release its CUDA blocks."""
+    _load_quantised_model.cache_clear()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def compile_for_generation(model, *, mode: str = "reduce-overhead") -> bool:  # noqa: D401
+    """Compile *model*'s forward with TorchInductor so decode steps replay as CUDA graphs.
+
+    A static KV cache is enabled when the model class supports it, which keeps
+    tensor shapes fixed and lets the whole step be captured as one graph.
+    Returns whether the static cache is in use.
+    """
+    import torch._dynamo.config
+    import torch._inductor.config
+
+    if hasattr(torch._inductor.config, "fx_graph_cache"):
+        torch._inductor.config.fx_graph_cache = True
+    torch._dynamo.config.cache_size_limit = 32
+
+    static_cache = getattr(model, "_supports_static_cache", False)
+    if static_cache:
+        model.generation_config.cache_implementation = "static"
+    model.forward = torch.compile(model.forward, mode=mode, fullgraph=static_cache)
+    logger.info("Compiled %s forward (mode=%s, static cache=%s)", type(model).__name__, mode, static_cache)
+    return static_cache
+
+
+def warm_up(
+    model,
+    tokenizer: Callable[[str, bool], object],
+    *,
+    prompt: str = "hello",
+    n: int = 3,
+    lengths: Sequence[int] = (),
+):  # noqa: D401
+    """Run quick dummy inference to compile kernels & fill caches.
+
+    When *lengths* is given the prompt is padded to each length in turn so every
+    input-shape bucket is compiled before the first real request.
+    """
     logger.info("Warming up model with %s iterations", n)
-    for _ in range(n):
-        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
-        _ = model.generate(**inputs, max_new_tokens=8)
-    torch.cuda.empty_cache()
+    with torch.inference_mode():
+        for length in lengths or (None,):
+            for _ in range(n):
+                if length is None:
+                    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+                else:
+                    inputs = tokenizer(
+                        prompt, return_tensors="pt", padding="max_length", truncation=True, max_length=length
+                    ).to(model.device)
+                _ = model.generate(**inputs, max_new_tokens=8)
+    # The blocks reserved above are left in the CUDA caching allocator for real requests
+    if torch.cuda.is_available():
+        logger.info("Warm-up done; %.0f MiB reserved", torch.cuda.memory_reserved() / (1 << 20))
 
 
 # Example usage:
@@ -1,60 +1,106 @@
-"""Flask response optimisation middleware (gzip + caching headers)."""
+"""Flask response optimisation middleware (Brotli/gzip + caching headers)."""
 from __future__ import annotations
 
-import functools
-import gzip
-import io
 import logging
 import zlib
-from datetime import timedelta
-from typing import Callable
+from functools import lru_cache
 
-from flask import Response, request
+from flask import request
+from flask_compress import Compress
+
+try:  # same Brotli binding Flask-Compress picks
+    import brotlicffi as brotli
+except ImportError:
+    import brotli
 
 logger = logging.getLogger(__name__)
 
+# JSON bodies above this size are compressed, Brotli first with gzip fallback.
+# Level 1 keeps the CPU cost near a memcpy while still shrinking JSON text ~3x.
+COMPRESS_MIN_SIZE = 256
+COMPRESS_LEVEL = 1
 
-class ResponseOptimizer:
-    """Wraps a WSGI application to compress JSON responses and set cache headers."""
+# Health/metrics polls return identical bodies; recent small ones are compressed once
+COMPRESS_CACHE_SIZE = 256
+COMPRESS_CACHE_MAX_BODY = 64 * 1024  # bytes; bounds the cache at ~16 MiB of input
 
-    def __init__(self, app, *, compress_level: int = 6) -> None:  # WSGI app
-        self.app = app
-        self.compress_level = compress_level
+# Only public, user-independent endpoints may keep their bodies in the cache;
+# transcripts and posts are per-user and always compressed afresh
+COMPRESS_CACHE_ENDPOINTS = frozenset({
+    "health_check",
+    "health_detailed",
+    "health_models",
+    "health_storage",
+    "metrics",
+    "get_available_tones",
+})
 
-    def __call__(self, environ, start_response):  # noqa: D401
-        # Detect client gzip support
-        accept_encoding = environ.get("HTTP_ACCEPT_ENCODING", "")
-        gzip_supported = "gzip" in accept_encoding.lower()
 
-        buffer: list[bytes] = []
+def _encode(body: bytes, algorithm: str, level: int) -> bytes:
+    if algorithm == "br":
+        return brotli.compress(body, quality=level)
+    # wbits=31 writes the gzip wrapper in the same zlib pass
+    return zlib.compress(body, level, wbits=31)
+
+
+_encode_cached = lru_cache(maxsize=COMPRESS_CACHE_SIZE)(_encode)
+
+
+class CachingCompress(Compress):
+    """Flask-Compress with single-call gzip and an LRU of recently compressed public bodies."""
+
+    def compress(self, app, response, algorithm):  # noqa: D401
+        if algorithm not in ("br", "gzip"):
+            return super().compress(app, response, algorithm)
+        body = response.get_data()
+        level = app.config["COMPRESS_BR_LEVEL" if algorithm == "br" else "COMPRESS_LEVEL"]
+        if len(body) > COMPRESS_CACHE_MAX_BODY or request.endpoint not in app.config["COMPRESS_CACHE_ENDPOINTS"]:
+            return _encode(body, algorithm, level)
+        return _encode_cached(body, algorithm, level)
+
 
-        def _write(data: bytes):  # noqa: D401
-            buffer.append(data)
+def client_has_etag(etag: str) -> bool:
+    """Whether If-None-Match already names *etag*, ignoring Flask-Compress's ':<encoding>' suffix."""
+    return any(tag.split(":", 1)[0] == etag for tag in request.if_none_match.as_set())
 
+
+class ResponseOptimizer:
+    """Wraps a WSGI application to set keep-alive and cache headers.
+
+    Compression itself is handled by Flask-Compress (see :func:`init_compression`),
+    which negotiates the encoding and skips small or non-JSON bodies.
+    """
+
+    def __init__(self, app) -> None:  # WSGI app
+        self.app = app
+
+    def __call__(self, environ, start_response):  # noqa: D401
         def _start_response(status, headers, exc_info=None):  # noqa: D401
-            nonlocal buffer
-            if gzip_supported and status.startswith("200"):  # Only compress success
-                headers = [(k.lower(), v) for k, v in headers]
-                # Remove existing content-length because it will change after compression
-                headers = [(k, v) for k, v in headers if k != "content-length"]
-                headers.append(("Content-Encoding", "gzip"))
             # Add Keep-Alive
             headers.append(("Connection", "keep-alive"))
-            # Add standard caching header for static-ish json (can be tuned)
-            headers.append(("Cache-Control", "no-store"))
+            # Responses that don't choose a cache policy must not be stored;
+            # views that opt into revalidation (e.g. ETag polls) keep theirs
+            if not any(name.lower() == "cache-control" for name, _ in headers):
+                headers.append(("Cache-Control", "no-store"))
             return start_response(status, headers, exc_info)
 
-        result = self.app(environ, _start_response)
-        data = b"".join(buffer + list(result))
-        if gzip_supported:
-            out = io.BytesIO()
-            with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=self.compress_level) as gz:
-                gz.write(data)
-            data = out.getvalue()
-        return [data]
+        return self.app(environ, _start_response)
 
 
-# Convenient factory for Flask
+# Convenient factories for Flask
 
 def init_response_optimizer(app):  # noqa: D401
     app.wsgi_app = ResponseOptimizer(app.wsgi_app)  # type: ignore[attr-defined]
+
+
+def init_compression(app):  # noqa: D401
+    app.config.setdefault("COMPRESS_MIMETYPES", ["application/json"])
+    app.config.setdefault("COMPRESS_ALGORITHM", ["br", "gzip"])
+    app.config.setdefault("COMPRESS_LEVEL", COMPRESS_LEVEL)
+    app.config.setdefault("COMPRESS_BR_LEVEL", COMPRESS_LEVEL)
+    app.config.setdefault("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE)
+    # Compressing a streamed response would buffer all of it first; send those as-is
+    app.config.setdefault("COMPRESS_STREAMS", False)
+    app.config.setdefault("COMPRESS_CACHE_ENDPOINTS", COMPRESS_CACHE_ENDPOINTS)
+    CachingCompress(app)
+    logger.info("Response compression enabled (br/gzip, >%s bytes)", app.config["COMPRESS_MIN_SIZE"])
@@ -4,8 +4,10 @@ Startup script for the Social Media Post Generator backend
 This script handles proper module imports and starts the Flask application
 """
 
+import functools
 import os
 import sys
+from concurrent.futures import Future
 from pathlib import Path
 
 # Add the current directory to Python path for proper imports
@@ -41,12 +43,16 @@ try:
 except Exception as e:
     logger.warning(f"Audio configuration failed: {e}")
 
-# Now import and run the Flask app
-try:
-    from flask import Flask, request, jsonify
-    from flask_cors import CORS
-    from dotenv import load_dotenv
-    
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+from dotenv import load_dotenv
+
+
+def create_app() -> Flask:
+    """Build the Flask app; optional services that fail to load are disabled, not fatal.
+
+    Serve with ``gunicorn 'run_app:create_app()'``.
+    """
     # Load environment variables
     load_dotenv()
     
@@ -54,6 +60,10 @@ try:
     app = Flask(__name__)
     CORS(app, resources={r"/*": {"origins": os.getenv('CORS_ORIGINS', '*')}})
     
+    # Serialise JSON responses with orjson
+    from performance.json_provider import init_json_provider
+    init_json_provider(app)
+    
     # Import services with error handling
     try:
         from services.upload_handler import AudioUploadHandler
@@ -81,7 +91,8 @@ try:
         from services.text_generation.flan_t5_service import flan_t5_service
         from services.text_generation.content_processor import ContentProcessor
         from services.text_generation.post_storage import post_storage
-        from templates.platform_templates import get_template
+        from templates.platform_templates import get_formatter
+        content_processor = ContentProcessor()
         advanced_services = True
         logger.info("Advanced services initialized successfully")
     except Exception as e:
@@ -90,11 +101,10 @@ try:
     
     # Try to import performance and monitoring modules
     try:
-        from performance.memory_manager import MemoryManager
+        from performance.memory_manager import MemoryManager, freeze_resident_objects
         from performance.worker_manager import WorkerManager
-        from monitoring.system_monitor import capture_metrics
+        from monitoring.system_monitor import cached_metrics
         from monitoring.app_monitor import metric_store
-        import threading
         
         # Initialize performance modules
         memory_manager = MemoryManager()
@@ -102,18 +112,9 @@ try:
         
         worker_manager = WorkerManager(max_workers=int(os.getenv('MAX_WORKERS', 4)))
         
-        def run_sync_in_worker(fn, *, description="job"):
-            """Run function in worker pool synchronously and return the result."""
-            completed = threading.Event()
-            container = {}
-            
-            def _wrap():
-                container['result'] = fn()
-                completed.set()
-            
-            worker_manager.submit_job(_wrap, description=description)
-            completed.wait()
-            return container.get('result')
+        def submit_to_worker(fn, *, description="job"):
+            """Queue function on the worker pool and return its Future."""
+            return worker_manager.submit_job(fn, description=description)
         
         performance_enabled = True
         logger.info("Performance and monitoring modules loaded successfully")
@@ -122,19 +123,27 @@ try:
         performance_enabled = False
         
         # Fallback function
-        def run_sync_in_worker(fn, *, description="job"):
-            """Fallback synchronous execution."""
-            return fn()
+        def submit_to_worker(fn, *, description="job"):
+            """Fallback: run function now and return a completed Future."""
+            future = Future()
+            try:
+                future.set_result(fn())
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
     
-    # Try to initialize models
-    try:
-        if whisper_service:
-            whisper_service.load_whisper_model()
-        if advanced_services:
-            flan_t5_service.load_model()
-        logger.info("Models loaded successfully on startup")
-    except Exception as e:
-        logger.error(f"Failed to load models on startup: {e}")
+    # Models load lazily on first use; PRELOAD_MODELS=1 loads them on startup instead
+    if os.getenv('PRELOAD_MODELS') == '1':
+        try:
+            if whisper_service:
+                whisper_service.load_whisper_model()
+            if advanced_services:
+                flan_t5_service.load_model()
+            if performance_enabled:
+                freeze_resident_objects()
+            logger.info("Models loaded successfully on startup")
+        except Exception as e:
+            logger.error(f"Failed to load models on startup: {e}")
     
     # Define routes
     @app.route('/api/health', methods=['GET'])
@@ -216,14 +225,12 @@ try:
                 }), 404
             
             # Start transcription - fix file path format
+            # Runs on this request thread: it would only block waiting on a worker otherwise
             file_path = os.path.abspath(file_metadata['file_path'])
-            transcription_result = run_sync_in_worker(
-                lambda: whisper_service.transcribe_audio(file_path), 
-                description="transcription"
-            )
+            transcription_result = whisper_service.transcribe_audio(file_path)
             
-            # Save transcription
-            whisper_service.save_transcription(file_id, transcription_result)
+            # Save transcription off the request thread; reads see it immediately
+            whisper_service.save_transcription_async(file_id, transcription_result)
             
             return jsonify({
                 'transcription_id': transcription_result['transcription_id'],
@@ -343,29 +350,39 @@ try:
             if not transcription_text:
                 return jsonify({'error': 'No transcription text found'}), 400
             
-            posts = {}
-            for platform in platforms:
+            prompts = [get_formatter(platform, tone)(content=transcription_text) for platform in platforms]
+            
+            # Greedy decoding is deterministic, so repeated requests can be served from cache
+            results = {}
+            if flan_t5_service.device == 'cuda':
+                # One padded generate call keeps all platforms on the GPU together
                 try:
-                    # Optimize prompt
-                    prompt = get_template(platform, tone).format(content=transcription_text)
-                    
-                    # Generate text using FLAN-T5
-                    generation_result = run_sync_in_worker(
-                        lambda: flan_t5_service.generate_text(prompt), 
-                        description="flan-generate"
-                    )
-                    generated_text = generation_result.get('text')
-                    
-                    # Process content
-                    processor = ContentProcessor()
-                    formatted_text = processor.format_for_platform(generated_text, platform)
-                    
-                    posts[platform] = formatted_text
+                    results = dict(zip(platforms, flan_t5_service.generate_batch(prompts, do_sample=False)))
                 except Exception as e:
-                    logger.error(f"Error generating post for {platform}: {e}")
+                    logger.error(f"Error generating posts for {', '.join(platforms)}: {e}")
+            else:
+                # Padding buys little on CPU, so queue every platform to run concurrently
+                futures = {
+                    platform: submit_to_worker(
+                        functools.partial(flan_t5_service.generate_text, prompt, do_sample=False),
+                        description=f"flan-generate:{platform}"
+                    )
+                    for platform, prompt in zip(platforms, prompts)
+                }
+                for platform, future in futures.items():
+                    try:
+                        results[platform] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error generating post for {platform}: {e}")
+            
+            posts = {}
+            generation_metadata = {}
+            for platform, generation_result in results.items():
+                # Process content
+                posts[platform] = content_processor.format_for_platform(generation_result.get('text'), platform)
+                generation_metadata = generation_result.get('metadata', {})
             
             # Save generated posts
-            generation_metadata = generation_result.get('metadata', {}) if 'generation_result' in locals() else {}
             post_id = post_storage.save_post(
                 transcription_id=transcription_id,
                 platforms=platforms,
@@ -417,7 +434,7 @@ try:
         def health_detailed():
             """Return detailed system status."""
             try:
-                sys_metrics = capture_metrics()
+                sys_metrics = cached_metrics()
                 return jsonify(sys_metrics.to_dict()), 200
             except Exception as e:
                 logger.error(f"Error in detailed health check: {e}")
@@ -441,26 +458,25 @@ try:
         # from security.security_headers import init_security_headers
         from security.rate_limiter import init_rate_limiter
         from monitoring.app_monitor import register_middleware
-        from performance.response_optimizer import init_response_optimizer
+        from performance.response_optimizer import init_response_optimizer, init_compression
         
         # init_security_headers(app)  # Temporarily disabled due to Talisman issues
         init_rate_limiter(app)
         register_middleware(app)
         init_response_optimizer(app)
+        init_compression(app)
         
         logger.info("Security and performance optimizations loaded (headers disabled)")
     except Exception as e:
         logger.warning(f"Security/performance optimizations failed to load: {e}")
     
-    # Start the application
-    if __name__ == '__main__':
-        logger.info("Starting Flask application...")
-        app.run(
-            debug=os.getenv('FLASK_ENV') != 'production',
-            host='0.0.0.0',
-            port=5000
-        )
+    return app
 
-except Exception as e:
-    print(f"Critical error starting application: {e}")
-    sys.exit(1)
+
+if __name__ == '__main__':
+    logger.info("Starting Flask application...")
+    create_app().run(
+        debug=os.getenv('FLASK_ENV') != 'production',
+        host='0.0.0.0',
+        port=5000
+    )
@@ -17,7 +17,7 @@ from typing import Tuple
 
 import magic  # type: ignore
 
-from backend.security.input_validator import sanitise_filename, validate_audio_file
+from backend.security.input_validator import HEADER_BYTES, sanitise_filename, validate_audio_header
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +28,36 @@ UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 QUARANTINE_ROOT.mkdir(parents=True, exist_ok=True)
 
 
+# Buffer for the userspace fallback copy (shutil's default is 64 KiB)
+COPY_BUFFER_SIZE = 1 << 20
+
+
+def _sendfile(file_stream, out_fd: int) -> bool:
+    """Copy a disk-backed *file_stream* into *out_fd* in the kernel; False if not possible."""
+    try:
+        in_fd = file_stream.fileno()
+        offset = file_stream.tell()
+    except (AttributeError, OSError):  # in-memory stream, e.g. a small spooled upload
+        return False
+    size = os.fstat(in_fd).st_size
+    try:
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError:
+        if offset == file_stream.tell():
+            return False  # nothing written yet; let the caller fall back
+        raise
+    return True
+
+
 def _store_file(file_stream, filename: str) -> Path:
     path = UPLOAD_ROOT / filename
     with path.open("wb") as f:
-        shutil.copyfileobj(file_stream, f)
+        if not (hasattr(os, "sendfile") and _sendfile(file_stream, f.fileno())):
+            shutil.copyfileobj(file_stream, f, COPY_BUFFER_SIZE)
     return path
 
 
@@ -45,13 +71,20 @@ def save_secure_file(file_storage) -> Tuple[bool, str]:
     file_id = uuid.uuid4().hex
     final_name = f"{file_id}_{safe_name}"
 
+    # Validate magic header from the stream, so rejected uploads never touch disk
+    stream = file_storage.stream
+    header = stream.read(HEADER_BYTES)
+    stream.seek(0)
+    try:
+        validate_audio_header(header)
+    except ValueError as exc:
+        logger.warning("Upload rejected before storage: %s", exc)
+        return False, str(exc)
+
     try:
-        path = _store_file(file_storage.stream, final_name)
+        path = _store_file(stream, final_name)
         from backend.security.virus_scanner import scan_file
-        # Virus scan first
         scan_file(path)
-        # Validate magic header
-        validate_audio_file(path)
         logger.info("Secure upload saved: %s", path)
         return True, file_id
     except Exception as exc:  # pragma: no cover
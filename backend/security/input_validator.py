@@ -11,12 +11,13 @@ import os
 import pathlib
 import re
 import uuid
+from functools import lru_cache
 from typing import Iterable
 
 import magic  # python-magic – *not* file-magic
 from werkzeug.utils import secure_filename
 
-AUDIO_MIME_TYPES: set[str] = {
+AUDIO_MIME_TYPES: frozenset[str] = frozenset({
     "audio/mpeg",
     "audio/wav",
     "audio/x-wav",
@@ -24,7 +25,7 @@ AUDIO_MIME_TYPES: set[str] = {
     "audio/vnd.wave",
     "audio/ogg",
     "audio/flac",
-}
+})
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -32,7 +33,8 @@ AUDIO_MIME_TYPES: set[str] = {
 
 
 def _is_allowed_audio(mime_type: str) -> bool:
-    return mime_type.lower() in AUDIO_MIME_TYPES
+    # libmagic and sniff_audio_mime return lowercase, so lower() is only a fallback
+    return mime_type in AUDIO_MIME_TYPES or mime_type.lower() in AUDIO_MIME_TYPES
 
 
 # ---------------------------------------------------------------------------
@@ -52,25 +54,62 @@ def sanitise_filename(filename: str) -> str:  # noqa: D401
     return filename
 
 
+@lru_cache(maxsize=8)
+def _resolved_dir(upload_dir: str) -> pathlib.Path:
+    return pathlib.Path(upload_dir).resolve()
+
+
 def validate_upload_path(upload_dir: str, filename: str) -> pathlib.Path:
     """Prevent path-traversal by ensuring *filename* resides in *upload_dir*."""
-    upload_dir_path = pathlib.Path(upload_dir).resolve()
+    upload_dir_path = _resolved_dir(upload_dir)
     full_path = (upload_dir_path / filename).resolve()
-    if not str(full_path).startswith(str(upload_dir_path)):
+    # Component-wise, so /uploads/audio-evil is not accepted for /uploads/audio
+    if not full_path.is_relative_to(upload_dir_path):
         raise ValueError("Invalid file path; potential path traversal attempt detected.")
     return full_path
 
 
 HEADER_BYTES = 2048  # Read first 2 KiB for mime-sniffing
 
+# One libmagic handle for the process, so the magic database is loaded once
+_MIME_MAGIC = magic.Magic(mime=True)
 
-def validate_audio_file(path: str | os.PathLike[str]) -> None:
-    """Validate that *path* points to a genuine audio file by header sniffing."""
-    mime = magic.from_file(str(path), mime=True)
+
+def sniff_audio_mime(header: bytes) -> str | None:
+    """Return the mime type of the accepted audio formats from their signature, else None."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "audio/x-wav"
+    if header[:4] == b"fLaC":
+        return "audio/flac"
+    if header[:4] == b"OggS":
+        return "audio/ogg"
+    if header[:3] == b"ID3":
+        return "audio/mpeg"
+    # MPEG audio frame sync (11 set bits) with a non-zero layer, which excludes AAC ADTS
+    if len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0 and header[1] & 0x06:
+        return "audio/mpeg"
+    return None
+
+
+def _check_audio_mime(mime: str) -> None:
     if not _is_allowed_audio(mime):
         raise ValueError(f"Unsupported or invalid audio mime-type detected: {mime}")
 
 
+def validate_audio_file(path: str | os.PathLike[str]) -> None:
+    """Validate that *path* points to a genuine audio file by header sniffing."""
+    with open(path, "rb") as f:
+        validate_audio_header(f.read(HEADER_BYTES))
+
+
+def validate_audio_header(header: bytes) -> None:
+    """Validate the leading *header* bytes of an upload before it is written anywhere.
+
+    Known signatures are matched in-process; libmagic only sees anything else.
+    """
+    _check_audio_mime(sniff_audio_mime(header) or _MIME_MAGIC.from_buffer(header))
+
+
 JSON_KEY_RE = re.compile(r"^[a-zA-Z0-9_]+$")
 
 
@@ -80,8 +119,9 @@ def validate_json_keys(data: dict[str, object], *, allowed: Iterable[str] | None
     Ensures keys are alphanumeric/underscore, preventing prototype pollution &
     other common attacks.  Optional *allowed* restricts keys strictly.
     """
+    is_valid_key = JSON_KEY_RE.fullmatch
     for key in data:
-        if not JSON_KEY_RE.fullmatch(key):
+        if not is_valid_key(key):
             raise ValueError(f"Illegal JSON key: {key}")
     if allowed is not None:
         extra = set(data) - set(allowed)
@@ -42,10 +42,16 @@ def init_rate_limiter(app: Flask) -> Limiter:  # noqa: D401
 
     * ``GLOBAL_RATE_LIMIT`` (default: ``"100 per hour"``)
     * ``UPLOAD_RATE_LIMIT`` (default: ``"5 per minute"``)
-    * ``TRANSCRIBE_RATE_LIMIT`` (default: ``"3 per minute"``)
+    * ``TRANSCRIBE_RATE_LIMIT`` (default: ``"3 per minute"``, shared by
+      ``/api/transcribe`` and ``/api/transcribe/stream``)
     * ``GENERATE_RATE_LIMIT`` (default: ``"10 per minute"``)
     * ``RATE_LIMIT_WHITELIST`` – comma-separated list of IP addresses that are
       completely exempt from the limiter (e.g., internal load balancers).
+    * ``RATE_LIMIT_STORAGE_URI`` (default: ``"memory://"``, per process) –
+      set a ``redis://`` URI in production so every Gunicorn worker shares
+      the same counters.
+    * ``RATE_LIMIT_STRATEGY`` (default: ``"moving-window"``) – the Redis
+      backend evaluates moving windows atomically in Lua scripts.
     """
 
     global_limit = os.getenv("GLOBAL_RATE_LIMIT", "100 per hour")
@@ -58,14 +64,20 @@ def init_rate_limiter(app: Flask) -> Limiter:  # noqa: D401
         key_func=get_remote_address,
         default_limits=[global_limit],
         storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+        strategy=os.getenv("RATE_LIMIT_STRATEGY", "moving-window"),
+        # Keep limiting per process if Redis becomes unreachable
+        in_memory_fallback_enabled=True,
         headers_enabled=True,
     )
 
-    # Whitelist handling – iterate after limiter initialisation so the config
-    # object exists.
-    whitelist = set(_parse_whitelist(os.getenv("RATE_LIMIT_WHITELIST")))
-    for ip in whitelist:
-        limiter.request_filter(lambda: get_remote_address() == ip)  # type: ignore[arg-type]
+    # Whitelist handling – one filter doing a set lookup, registered after
+    # limiter initialisation so the config object exists.
+    whitelist = frozenset(_parse_whitelist(os.getenv("RATE_LIMIT_WHITELIST")))
+    if whitelist:
+
+        @limiter.request_filter
+        def _is_whitelisted() -> bool:
+            return get_remote_address() in whitelist
 
     # ---------------------------------------------------------------------
     # Endpoint-specific limits – functions must already be registered on the
@@ -73,12 +85,18 @@ def init_rate_limiter(app: Flask) -> Limiter:  # noqa: D401
     # initialiser should run *after* all view functions are defined but
     # *before* the app starts serving requests.
     # ---------------------------------------------------------------------
+    # The limiter only checks a decorated limit inside the wrapper it returns,
+    # so each wrapper must replace the registered view function.
     endpts = app.view_functions
     if "upload_file" in endpts:
-        limiter.limit(upload_limit)(endpts["upload_file"])
-    if "transcribe_audio" in endpts:
-        limiter.limit(transcribe_limit)(endpts["transcribe_audio"])
+        endpts["upload_file"] = limiter.limit(upload_limit)(endpts["upload_file"])
+    # Both transcription routes run a full Whisper job, so they draw on one
+    # shared budget and cannot be alternated to double it
+    transcribe_scope = limiter.shared_limit(transcribe_limit, scope="transcribe")
+    for endpoint in ("transcribe_audio", "transcribe_audio_stream"):
+        if endpoint in endpts:
+            endpts[endpoint] = transcribe_scope(endpts[endpoint])
     if "generate_posts" in endpts:
-        limiter.limit(generate_limit)(endpts["generate_posts"])
+        endpts["generate_posts"] = limiter.limit(generate_limit)(endpts["generate_posts"])
 
     return limiter
@@ -8,6 +8,10 @@ CHARACTER_LIMITS = {
     'instagram': 2200
 }
 
+HASHTAG_PATTERN = re.compile(r"#\w+")
+GENERATION_ARTIFACTS = ("&lt;&gt;", "<eos>", "#%^&*")  # Placeholder artifacts, customize as needed
+GENERATION_ARTIFACT_PATTERN = re.compile("|".join(map(re.escape, GENERATION_ARTIFACTS)))
+
 class ContentProcessor:
     """
     Processes and formats generated content for various social media platforms.
@@ -54,7 +58,7 @@ class ContentProcessor:
         Returns:
             List of hashtags.
         """
-        return re.findall(r"#\w+", text)
+        return HASHTAG_PATTERN.findall(text)
 
     @staticmethod
     def add_emojis(text: str, platform: str) -> str:
@@ -84,7 +88,4 @@ class ContentProcessor:
         Returns:
             Cleaned text.
         """
-        artifacts = ["&lt;&gt;", "<eos>", "#%^&*"]  # Placeholder artifacts, customize as needed
-        for artifact in artifacts:
-            text = text.replace(artifact, " ")
-        return ' '.join(text.split())
+        return ' '.join(GENERATION_ARTIFACT_PATTERN.sub(" ", text).split())
@@ -0,0 +1,94 @@
+"""Dynamic batching for FLAN-T5 generation on CUDA.
+
+Concurrent :meth:`FlanT5Service.generate_text` calls are collected for up to
+``MAX_WAIT_MS`` (or until ``BATCH_SIZE`` prompts are waiting), grouped by their
+generation settings and handed to :meth:`FlanT5Service.generate_batch`, so each
+group costs one padded ``generate`` call.  Results are delivered back through
+:class:`concurrent.futures.Future` objects.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("FLAN_T5_BATCH_SIZE", "8"))
+MAX_WAIT_MS = int(os.getenv("FLAN_T5_BATCH_MAX_WAIT_MS", "10"))
+
+# (max_length, temperature, top_p, do_sample); None keeps the service default
+Settings = Tuple[Optional[int], Optional[float], Optional[float], Optional[bool]]
+Job = Tuple[str, Settings, Future]
+
+
+class FlanT5Batcher(threading.Thread):
+    """Background thread that groups queued prompts into batched generate calls."""
+
+    def __init__(self, flan_t5_service, *, batch_size: int = BATCH_SIZE, max_wait_ms: int = MAX_WAIT_MS) -> None:
+        super().__init__(daemon=True)
+        self.flan_t5_service = flan_t5_service
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._stop_event = threading.Event()
+
+    def submit(self, prompt: str, settings: Settings) -> Future:
+        """Queue *prompt* for generation and return a future for its result dict."""
+        future: Future = Future()
+        self._queue.put((prompt, settings, future))
+        return future
+
+    def _collect(self, first: Job) -> List[Job]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Drop jobs whose caller already gave up
+        return [job for job in batch if job[2].set_running_or_notify_cancel()]
+
+    def _generate(self, settings: Settings, jobs: List[Job]) -> None:
+        max_length, temperature, top_p, do_sample = settings
+        try:
+            results = self.flan_t5_service.generate_batch(
+                [prompt for prompt, _, _ in jobs],
+                max_length=max_length,
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=do_sample
+            )
+        except Exception as exc:  # pragma: no cover
+            logger.exception("FlanT5Batcher: batch failed – %s", exc)
+            for _, _, fut in jobs:
+                fut.set_exception(exc)
+            return
+        for (_, _, fut), result in zip(jobs, results):
+            fut.set_result(result)
+
+    def run(self) -> None:  # noqa: D401
+        logger.info("FlanT5Batcher started – batch size %s, max wait %s ms", self.batch_size, int(self.max_wait * 1000))
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            groups: Dict[Settings, List[Job]] = defaultdict(list)
+            for job in self._collect(first):
+                groups[job[1]].append(job)
+            for settings, jobs in groups.items():
+                logger.debug("FlanT5Batcher: generating batch of %s prompt(s)", len(jobs))
+                self._generate(settings, jobs)
+
+    def stop(self) -> None:
+        self._stop_event.set()
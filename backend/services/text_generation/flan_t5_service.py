@@ -6,18 +6,25 @@ Enterprise-grade implementation of FLAN-T5 for social media post generation.
 Handles model loading, text generation, and error management.
 """
 
+import copy
 import os
+import re
 import time
 import logging
 import threading
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Union
+from dataclasses import asdict, dataclass
 from contextlib import contextmanager
+from functools import lru_cache
 
 import torch
-from transformers import T5Tokenizer, T5ForConditionalGeneration
+from transformers import BitsAndBytesConfig, T5Tokenizer, T5ForConditionalGeneration
+from transformers import GenerationConfig as HFGenerationConfig
 from transformers.utils import logging as transformers_logging
 
+from performance.model_optimizer import INT8_THRESHOLD, compile_for_generation, warm_up
+from services.text_generation.flan_t5_batcher import FlanT5Batcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,6 +32,27 @@ logger = logging.getLogger(__name__)
 # Suppress verbose transformers logging
 transformers_logging.set_verbosity_error()
 
+# Prompt lengths (in tokens) compiled ahead of the first request; a compiled
+# model gets every input padded up to the nearest one (see _encode)
+COMPILE_WARMUP_LENGTHS = (64, 256, 512)
+
+# Weight precisions for CUDA; 'int8' uses bitsandbytes instead of a dtype
+CUDA_DTYPES = {'bf16': torch.bfloat16, 'fp16': torch.float16, 'none': torch.float32}
+
+# Special tokens and echoed instruction labels stripped from generated text
+OUTPUT_ARTIFACTS = (
+    '<pad>', '</s>', '<s>', '<unk>',
+    'Question:', 'Answer:', 'Context:',
+    'Generate:', 'Create:', 'Write:'
+)
+OUTPUT_ARTIFACT_PATTERN = re.compile('|'.join(map(re.escape, OUTPUT_ARTIFACTS)))
+
+# Entries kept by the per-service prompt caches (tokenized inputs and greedy results)
+PROMPT_CACHE_SIZE = int(os.getenv('FLAN_T5_PROMPT_CACHE_SIZE', '128'))
+
+# Whitespace that ' '.join(text.split()) would change: runs, non-space characters, or edges
+UNNORMALISED_WHITESPACE = re.compile(r'\s\s|[^\S ]|^\s|\s$')
+
 @dataclass
 class GenerationConfig:
     """Configuration for text generation parameters"""
@@ -36,7 +64,6 @@ class GenerationConfig:
     num_return_sequences: int = 1
     repetition_penalty: float = 1.1
     length_penalty: float = 1.0
-    early_stopping: bool = True
     pad_token_id: int = 0
     eos_token_id: int = 1
 
@@ -69,7 +96,22 @@ class FlanT5Service:
         self.model = None
         self.tokenizer = None
         self.device = None
+        self.quantization = None
         self.generation_config = GenerationConfig()
+        # Prebuilt transformers config for generate_text; see _build_hf_generation_config
+        self._hf_generation_config: Optional[HFGenerationConfig] = None
+        # Variants of it for per-call overrides, each derived once
+        self._hf_config_variant = lru_cache(maxsize=32)(self._derive_hf_config)
+        # Coalesces concurrent generate_text calls on CUDA (FLAN_T5_BATCHING=0 disables)
+        self._batcher: Optional[FlanT5Batcher] = None
+        # Side stream for host-to-device input copies, so they overlap generate
+        # kernels already queued on the compute stream by other callers
+        self._copy_stream: Optional[torch.cuda.Stream] = None
+        # Warmed-up input lengths that _encode pads to; empty when running eager
+        self._pad_lengths: Tuple[int, ...] = ()
+        # Repeated prompts skip the tokenizer; greedy output is deterministic, so its text is reused
+        self._tokenize_cached = lru_cache(maxsize=PROMPT_CACHE_SIZE)(self._tokenize)
+        self._generate_greedy_cached = lru_cache(maxsize=PROMPT_CACHE_SIZE)(self._generate_greedy)
         self._loading_lock = threading.Lock()
         self._model_loaded = False
         
@@ -106,6 +148,20 @@ class FlanT5Service:
             logger.warning(f"Error detecting device: {e}. Falling back to CPU.")
             return "cpu"
     
+    def _default_quantization(self) -> str:
+        """
+        Pick the weight precision for the detected device
+        
+        Returns:
+            'bf16' on Ampere+ GPUs, 'fp16' on older GPUs, 'int8' (dynamic
+            quantisation) on CPU and 'none' elsewhere
+        """
+        if self.device == 'cuda':
+            return 'bf16' if torch.cuda.is_bf16_supported() else 'fp16'
+        if self.device == 'cpu':
+            return 'int8'
+        return 'none'
+    
     def load_model(self) -> Dict[str, Any]:
         """
         Load the FLAN-T5 model and tokenizer with thread safety
@@ -125,8 +181,10 @@ class FlanT5Service:
                 start_time = time.time()
                 logger.info(f"Loading FLAN-T5 model: {self.model_name}")
                 
-                # Detect device
+                # Detect device and weight precision (FLAN_T5_QUANTIZATION overrides)
                 self.device = self._detect_device()
+                self.quantization = os.getenv('FLAN_T5_QUANTIZATION', self._default_quantization())
+                logger.info(f"Using {self.quantization} weights")
                 
                 # Load tokenizer
                 logger.info("Loading tokenizer...")
@@ -143,17 +201,30 @@ class FlanT5Service:
                 # Load model
                 logger.info("Loading model...")
                 if self.device == 'cuda':
+                    if self.quantization == 'int8':
+                        precision = {'quantization_config': BitsAndBytesConfig(
+                            load_in_8bit=True, llm_int8_threshold=INT8_THRESHOLD
+                        )}
+                    else:
+                        precision = {'torch_dtype': CUDA_DTYPES[self.quantization]}
                     self.model = T5ForConditionalGeneration.from_pretrained(
                         self.model_name,
-                        torch_dtype=torch.float16,
                         device_map="auto",
-                        low_cpu_mem_usage=True
+                        low_cpu_mem_usage=True,
+                        **precision
                     )
                 else:
+                    # bf16 halves weight traffic on CPUs with oneDNN bf16 kernels
+                    cpu_dtype = torch.float32
+                    if self.quantization == 'bf16':
+                        if torch.ops.mkldnn._is_mkldnn_bf16_supported():
+                            cpu_dtype = torch.bfloat16
+                        else:
+                            logger.warning("CPU lacks bf16 support; loading fp32 weights")
                     # For CPU, don't use device_map or low_cpu_mem_usage
                     self.model = T5ForConditionalGeneration.from_pretrained(
                         self.model_name,
-                        torch_dtype=torch.float32
+                        torch_dtype=cpu_dtype
                     )
                 
                 # Move model to device if not using device_map
@@ -162,11 +233,31 @@ class FlanT5Service:
                 
                 # Set model to evaluation mode
                 self.model.eval()
+                num_parameters = sum(p.numel() for p in self.model.parameters())
+                
+                # int8 dynamic quantisation of Linear layers on CPU
+                if self.device == 'cpu' and self.quantization == 'int8':
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
                 
                 # Update generation config with tokenizer info
                 self.generation_config.pad_token_id = self.tokenizer.pad_token_id
                 self.generation_config.eos_token_id = self.tokenizer.eos_token_id
                 
+                # Compile decode step into CUDA graphs (FLAN_T5_COMPILE=0 disables)
+                if self.device == 'cuda' and self.quantization != 'int8' and os.getenv('FLAN_T5_COMPILE', '1') == '1':
+                    self._compile_model()
+                
+                self._hf_generation_config = self._build_hf_generation_config()
+                self._hf_config_variant.cache_clear()
+                self._copy_stream = torch.cuda.Stream() if self.device == 'cuda' else None
+                
+                # Padding buys little on CPU, so only CUDA coalesces concurrent prompts
+                if self.device == 'cuda' and os.getenv('FLAN_T5_BATCHING', '1') == '1':
+                    self._batcher = FlanT5Batcher(self)
+                    self._batcher.start()
+                
                 load_time = time.time() - start_time
                 self._model_loaded = True
                 
@@ -177,7 +268,8 @@ class FlanT5Service:
                     'model_name': self.model_name,
                     'device': str(self.device),
                     'load_time': load_time,
-                    'model_size': f"{sum(p.numel() for p in self.model.parameters()) / 1e6:.1f}M parameters"
+                    'quantization': self.quantization,
+                    'model_size': f"{num_parameters / 1e6:.1f}M parameters"
                 }
                 
             except Exception as e:
@@ -185,6 +277,50 @@ class FlanT5Service:
                 logger.error(error_msg)
                 raise ModelLoadingError(error_msg)
     
+    def _compile_model(self):
+        """
+        Compile the model forward with torch.compile and warm up each
+        prompt-length bucket, falling back to eager mode on failure
+        """
+        eager_forward = self.model.forward
+        try:
+            compile_for_generation(self.model)
+            warm_up(self.model, self.tokenizer, prompt="Write a post:", lengths=COMPILE_WARMUP_LENGTHS)
+            self._pad_lengths = COMPILE_WARMUP_LENGTHS
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager mode: {e}")
+            self.model.forward = eager_forward
+            self.model.generation_config.cache_implementation = None
+    
+    def _build_hf_generation_config(self) -> HFGenerationConfig:
+        """
+        Merge the service defaults into a copy of the model's generation config,
+        keeping settings such as the static cache chosen by _compile_model
+        """
+        hf_config = copy.deepcopy(self.model.generation_config)
+        hf_config.update(**asdict(self.generation_config), num_beams=1, use_cache=True)
+        return hf_config
+    
+    def _derive_hf_config(self, override_items) -> HFGenerationConfig:
+        """Copy the prebuilt config with the given (key, value) overrides applied"""
+        hf_config = copy.deepcopy(self._hf_generation_config)
+        hf_config.update(**dict(override_items))
+        return hf_config
+    
+    def _hf_config_for(self, overrides: Dict[str, Any]) -> HFGenerationConfig:
+        """
+        Return the generation config for a call's overrides without mutating the shared one
+        
+        Each distinct set of hashable overrides is derived once and reused.
+        """
+        if not overrides:
+            return self._hf_generation_config
+        try:
+            return self._hf_config_variant(tuple(sorted(overrides.items())))
+        except TypeError:
+            # Unhashable values (e.g. bad_words_ids lists) get a one-off copy
+            return self._derive_hf_config(overrides.items())
+    
     def _validate_input(self, prompt: str) -> str:
         """
         Validate and sanitize input prompt
@@ -198,8 +334,9 @@ class FlanT5Service:
         if not prompt or not prompt.strip():
             raise ValueError("Prompt cannot be empty")
         
-        # Remove excessive whitespace
-        prompt = ' '.join(prompt.split())
+        # Remove excessive whitespace (already-clean prompts are not copied)
+        if UNNORMALISED_WHITESPACE.search(prompt):
+            prompt = ' '.join(prompt.split())
         
         # Limit prompt length to prevent memory issues
         max_prompt_length = 1000
@@ -222,18 +359,12 @@ class FlanT5Service:
         if not generated_text:
             return ""
         
-        # Remove extra whitespace
-        text = ' '.join(generated_text.split())
-        
-        # Remove common artifacts
-        artifacts = [
-            '<pad>', '</s>', '<s>', '<unk>',
-            'Question:', 'Answer:', 'Context:',
-            'Generate:', 'Create:', 'Write:'
-        ]
-        
-        for artifact in artifacts:
-            text = text.replace(artifact, '').strip()
+        # Remove common artifacts in one pass (every artifact contains '<' or ':',
+        # so clean output skips the regex), then extra whitespace
+        text = generated_text
+        if '<' in text or ':' in text:
+            text = OUTPUT_ARTIFACT_PATTERN.sub('', text)
+        text = ' '.join(text.split())
         
         # Ensure proper sentence ending
         if text and not text.endswith(('.', '!', '?')):
@@ -247,20 +378,115 @@ class FlanT5Service:
     def _generation_context(self):
         """Context manager for generation with error handling and cleanup"""
         try:
+            # Load lazily on first use
             if not self._model_loaded:
-                raise TextGenerationError("Model not loaded. Call load_model() first.")
+                self.load_model()
             
             # Set model to evaluation mode
             self.model.eval()
             
-            # Disable gradient computation
-            with torch.no_grad():
+            # Disable autograd, including version counters and view tracking
+            with torch.inference_mode():
                 yield
                 
         except Exception as e:
             self.generation_stats['errors'] += 1
             raise TextGenerationError(f"Generation failed: {str(e)}")
     
+    def _to_device(self, *tensors):
+        """
+        Copy input tensors to the model device
+        
+        On CUDA the pinned tensors are copied asynchronously on the copy stream;
+        the caller's stream waits for the copy before its generate kernels run.
+        """
+        if self._copy_stream is None:
+            return tuple(tensor.to(self.device) for tensor in tensors)
+        compute_stream = torch.cuda.current_stream()
+        with torch.cuda.stream(self._copy_stream):
+            copies = tuple(tensor.to(self.device, non_blocking=True) for tensor in tensors)
+        compute_stream.wait_stream(self._copy_stream)
+        for copy_ in copies:
+            # Allocated on the copy stream, consumed on the compute stream
+            copy_.record_stream(compute_stream)
+        return copies
+    
+    def _encode(self, text: Union[str, List[str]]):
+        """
+        Tokenize one prompt or a batch, padded to the longest input
+        
+        Once compiled, inputs are padded up to the nearest warmed-up length
+        instead, so generate replays a shape captured at startup rather than
+        recompiling for each new prompt length.
+        """
+        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        length = inputs['input_ids'].shape[-1]
+        bucket = next((size for size in self._pad_lengths if size >= length), length)
+        if bucket != length:
+            inputs = self.tokenizer(
+                text, return_tensors="pt", padding="max_length", truncation=True, max_length=bucket
+            )
+        return inputs
+    
+    def _tokenize(self, prompt: str):
+        """
+        Tokenize a single prompt, pinning the tensors on CUDA for faster copies
+        
+        Args:
+            prompt: Validated input prompt
+            
+        Returns:
+            Tuple of (input_ids, attention_mask) CPU tensors
+        """
+        inputs = self._encode(prompt)
+        input_ids, attention_mask = inputs['input_ids'], inputs['attention_mask']
+        if self.device == 'cuda':
+            input_ids, attention_mask = input_ids.pin_memory(), attention_mask.pin_memory()
+        return input_ids, attention_mask
+    
+    def _generate_greedy(
+        self,
+        prompt: str,
+        max_length: Optional[int],
+        temperature: Optional[float],
+        top_p: Optional[float]
+    ) -> str:
+        """
+        Greedy generation returning only the (immutable) text; wrapped per
+        service in an LRU as _generate_greedy_cached
+        """
+        if self._batcher is not None:
+            result = self._batcher.submit(prompt, (max_length, temperature, top_p, False)).result()
+        else:
+            result = self._generate(prompt, max_length, temperature, top_p, do_sample=False)
+        return result['text']
+    
+    def _build_result(
+        self,
+        prompt: str,
+        text: str,
+        generation_time: float,
+        max_length: int,
+        temperature: float,
+        top_p: float
+    ) -> Dict[str, Any]:
+        """Build the result dictionary returned for one generated text"""
+        return {
+            'text': text,
+            'generation_time': generation_time,
+            'prompt': prompt,
+            'config': {
+                'max_length': max_length,
+                'temperature': temperature,
+                'top_p': top_p
+            },
+            'metadata': {
+                'model': self.model_name,
+                'device': str(self.device),
+                'timestamp': time.time()
+            }
+        }
+    
     def generate_text(
         self,
         prompt: str,
@@ -288,87 +514,176 @@ class FlanT5Service:
             # Validate input
             prompt = self._validate_input(prompt)
             
-            # Update generation config with provided parameters
+            # Greedy decoding is deterministic, so a repeated request reuses the cached text;
+            # the result around it is built fresh, with this call's timing
+            simple_settings = set(kwargs) <= {'do_sample'}
+            if simple_settings and not kwargs.get('do_sample', self.generation_config.do_sample):
+                text = self._generate_greedy_cached(prompt, max_length, temperature, top_p)
+                config = self.generation_config
+                return self._build_result(
+                    prompt,
+                    text,
+                    time.time() - start_time,
+                    config.max_length if max_length is None else max_length,
+                    config.temperature if temperature is None else temperature,
+                    config.top_p if top_p is None else top_p
+                )
+            
+            # Settings generate_batch understands can share a padded batch with other callers
+            if self._batcher is not None and simple_settings:
+                settings = (max_length, temperature, top_p, kwargs.get('do_sample'))
+                return self._batcher.submit(prompt, settings).result()
+            
+            return self._generate(prompt, max_length, temperature, top_p, **kwargs)
+                
+        except Exception as e:
+            error_msg = f"Text generation failed: {str(e)}"
+            logger.error(error_msg)
+            raise TextGenerationError(error_msg)
+    
+    def _generate(
+        self,
+        prompt: str,
+        max_length: Optional[int],
+        temperature: Optional[float],
+        top_p: Optional[float],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Run generate for one validated prompt; see generate_text for the arguments"""
+        start_time = time.time()
+        
+        # Per-call overrides select a derived copy; the shared config is never mutated
+        overrides = {
+            key: value
+            for key, value in (('max_length', max_length), ('temperature', temperature), ('top_p', top_p))
+            if value is not None
+        }
+        overrides.update(kwargs)
+        
+        with self._generation_context():
+            config = self._hf_config_for(overrides)
+            
+            # Tokenize input (cached per prompt, pinned on CUDA)
+            input_ids, attention_mask = self._to_device(*self._tokenize_cached(prompt))
+            
+            # Generate text (KV cache on, greedy or sampled without beams)
+            outputs = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                generation_config=config
+            )
+            
+            # Decode generated text
+            generated_text = self.tokenizer.decode(
+                outputs[0],
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+            
+            # Post-process output
+            generated_text = self._post_process_output(generated_text)
+            
+            generation_time = time.time() - start_time
+            
+            # Update statistics
+            self.generation_stats['total_generations'] += 1
+            self.generation_stats['total_time'] += generation_time
+            self.generation_stats['average_time'] = (
+                self.generation_stats['total_time'] / 
+                self.generation_stats['total_generations']
+            )
+            
+            logger.info(f"Generated text in {generation_time:.2f} seconds")
+            
+            return self._build_result(
+                prompt, generated_text, generation_time, config.max_length, config.temperature, config.top_p
+            )
+    
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_length: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        do_sample: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate text for several prompts with a single padded generate call
+        
+        Args:
+            prompts: Input text prompts
+            max_length: Maximum length of generated text
+            temperature: Sampling temperature
+            top_p: Top-p sampling parameter
+            do_sample: Whether to sample instead of greedy decoding
+            
+        Returns:
+            List of dictionaries with generated text and metadata, one per prompt
+        """
+        start_time = time.time()
+        
+        try:
+            prompts = [self._validate_input(prompt) for prompt in prompts]
+            
             config = self.generation_config
-            if max_length is not None:
-                config.max_length = max_length
-            if temperature is not None:
-                config.temperature = temperature
-            if top_p is not None:
-                config.top_p = top_p
-            
-            # Update config with additional kwargs
-            for key, value in kwargs.items():
-                if hasattr(config, key):
-                    setattr(config, key, value)
+            max_length = config.max_length if max_length is None else max_length
+            temperature = config.temperature if temperature is None else temperature
+            top_p = config.top_p if top_p is None else top_p
+            do_sample = config.do_sample if do_sample is None else do_sample
             
             with self._generation_context():
-                # Tokenize input
-                inputs = self.tokenizer(
-                    prompt,
-                    return_tensors="pt",
-                    padding=True,
-                    truncation=True,
-                    max_length=512
-                ).to(self.device)
+                inputs = self._encode(prompts)
+                input_ids, attention_mask = inputs['input_ids'], inputs['attention_mask']
+                if self._copy_stream is not None:
+                    input_ids, attention_mask = input_ids.pin_memory(), attention_mask.pin_memory()
+                input_ids, attention_mask = self._to_device(input_ids, attention_mask)
                 
-                # Generate text
                 outputs = self.model.generate(
-                    inputs.input_ids,
-                    attention_mask=inputs.attention_mask,
-                    max_length=config.max_length,
-                    temperature=config.temperature,
-                    top_p=config.top_p,
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    max_length=max_length,
+                    temperature=temperature,
+                    top_p=top_p,
                     top_k=config.top_k,
-                    do_sample=config.do_sample,
-                    num_return_sequences=config.num_return_sequences,
+                    do_sample=do_sample,
+                    num_beams=1,
                     repetition_penalty=config.repetition_penalty,
-                    length_penalty=config.length_penalty,
-                    early_stopping=config.early_stopping,
                     pad_token_id=config.pad_token_id,
                     eos_token_id=config.eos_token_id
                 )
                 
-                # Decode generated text
-                generated_text = self.tokenizer.decode(
-                    outputs[0],
+                generated_texts = self.tokenizer.batch_decode(
+                    outputs,
                     skip_special_tokens=True,
                     clean_up_tokenization_spaces=True
                 )
                 
-                # Post-process output
-                generated_text = self._post_process_output(generated_text)
-                
                 generation_time = time.time() - start_time
                 
                 # Update statistics
-                self.generation_stats['total_generations'] += 1
+                self.generation_stats['total_generations'] += len(prompts)
                 self.generation_stats['total_time'] += generation_time
                 self.generation_stats['average_time'] = (
                     self.generation_stats['total_time'] / 
                     self.generation_stats['total_generations']
                 )
                 
-                logger.info(f"Generated text in {generation_time:.2f} seconds")
+                logger.info(f"Generated {len(prompts)} texts in {generation_time:.2f} seconds")
                 
-                return {
-                    'text': generated_text,
-                    'generation_time': generation_time,
-                    'prompt': prompt,
-                    'config': {
-                        'max_length': config.max_length,
-                        'temperature': config.temperature,
-                        'top_p': config.top_p
-                    },
-                    'metadata': {
-                        'model': self.model_name,
-                        'device': str(self.device),
-                        'timestamp': time.time()
-                    }
-                }
+                return [
+                    self._build_result(
+                        prompt,
+                        self._post_process_output(generated_text),
+                        generation_time,
+                        max_length,
+                        temperature,
+                        top_p
+                    )
+                    for prompt, generated_text in zip(prompts, generated_texts)
+                ]
                 
         except Exception as e:
-            error_msg = f"Text generation failed: {str(e)}"
+            error_msg = f"Batch text generation failed: {str(e)}"
             logger.error(error_msg)
             raise TextGenerationError(error_msg)
     
@@ -383,6 +698,7 @@ class FlanT5Service:
             'model_name': self.model_name,
             'model_loaded': self._model_loaded,
             'device': str(self.device) if self.device else None,
+            'quantization': self.quantization,
             'generation_stats': self.generation_stats.copy()
         }
     
@@ -439,6 +755,16 @@ class FlanT5Service:
     def cleanup(self):
         """Clean up resources"""
         try:
+            if self._batcher is not None:
+                self._batcher.stop()
+                self._batcher = None
+            self._copy_stream = None
+            
+            # Cached tensors and results belong to the model being released
+            self._tokenize_cached.cache_clear()
+            self._generate_greedy_cached.cache_clear()
+            self._hf_config_variant.cache_clear()
+            
             if self.model is not None:
                 del self.model
                 self.model = None
@@ -7,14 +7,17 @@ and improved text generation quality.
 """
 
 import logging
+import os
 import time
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 import signal
 
 from .flan_t5_service import flan_t5_service, TextGenerationError
+from performance.generation_cache import DEFAULT_TTL, cache_key, generation_cache
+from templates.platform_templates import PLATFORM_TEMPLATES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,6 +47,33 @@ class PostGenerationConfig:
     key_points: List[str] = None
     call_to_action: bool = False
     generation_timeout: int = 30
+    platform: Optional[str] = None
+    # Sampled output varies per call, so only greedy (False) output is cached
+    do_sample: bool = True
+
+# Generation length for each platform's post; unlisted platforms use the default
+PLATFORM_MAX_LENGTH = {'twitter': 280}
+DEFAULT_MAX_LENGTH = 500
+
+def platform_configs(platforms: List[str], **options: Any) -> List[PostGenerationConfig]:
+    """
+    Build the per-platform configs for /api/generate-posts
+    
+    Decoding is greedy, so repeating a request for the same transcript, tone
+    and platforms is served from the generation cache instead of the model.
+    
+    Args:
+        platforms: Platforms to generate posts for
+        **options: Other PostGenerationConfig fields shared by every platform
+        
+    Returns:
+        One configuration per platform, in the same order
+    """
+    base_config = PostGenerationConfig(do_sample=False, **options)
+    return [
+        replace(base_config, max_length=PLATFORM_MAX_LENGTH.get(platform, DEFAULT_MAX_LENGTH), platform=platform)
+        for platform in platforms
+    ]
 
 class PostGenerationTimeout(Exception):
     """Exception for generation timeout"""
@@ -64,7 +94,12 @@ class PostGenerator:
             'timeout': 0,
             'average_generation_time': 0.0
         }
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Each pool worker in app.generate_posts' per-platform fan-out blocks on one
+        # generation here, so this must not be the narrower of the two pools
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(len(PLATFORM_TEMPLATES), int(os.getenv('MAX_WORKERS', 4))),
+            thread_name_prefix="post-generation"
+        )
         
     def _initialize_tone_prompts(self) -> Dict[PostTone, str]:
         """Initialize tone-specific prompts for better generation"""
@@ -123,7 +158,13 @@ Urgent post:"""
         raise PostGenerationTimeout("Post generation timed out")
     
     def _generate_with_timeout(self, prompt: str, config: PostGenerationConfig) -> str:
-        """Generate text with timeout protection"""
+        """Generate text with timeout protection, reusing cached greedy output for identical prompts"""
+        key = cache_key(config.max_length, prompt)
+        if not config.do_sample:
+            cached = generation_cache.get(key)
+            if cached is not None:
+                logger.info("Generation cache hit")
+                return cached
         
         def generate_text():
             return flan_t5_service.generate_text(
@@ -131,7 +172,7 @@ Urgent post:"""
                 max_length=config.max_length,
                 temperature=0.8,
                 top_p=0.9,
-                do_sample=True
+                do_sample=config.do_sample
             )
         
         # Use ThreadPoolExecutor for timeout control
@@ -139,6 +180,8 @@ Urgent post:"""
         
         try:
             result = future.result(timeout=config.generation_timeout)
+            if not config.do_sample:
+                generation_cache.setex(key, DEFAULT_TTL, result['text'])
             return result['text']
         except TimeoutError:
             future.cancel()
@@ -149,6 +192,9 @@ Urgent post:"""
         """Enhance prompt with additional context and requirements"""
         enhancements = []
         
+        if config.platform:
+            enhancements.append(f"Write it for {config.platform.title()}.")
+        
         if config.include_hashtags:
             enhancements.append("Include relevant hashtags.")
         
@@ -215,6 +261,63 @@ Urgent post:"""
         
         return processed_text.strip()
     
+    def _prepare_content(self, content: str) -> str:
+        """Validate source content and truncate it to the prompt budget"""
+        if not content or not content.strip():
+            raise ValueError("Content cannot be empty")
+        
+        content = content.strip()
+        if len(content) > 2000:
+            content = content[:2000] + "..."
+            logger.warning("Content truncated to 2000 characters")
+        
+        return content
+    
+    def _build_prompt(self, content: str, config: PostGenerationConfig) -> str:
+        """Build the tone-specific prompt enhanced with configuration context"""
+        base_prompt = self.tone_prompts[config.tone].format(content=content)
+        return self._enhance_prompt_with_context(base_prompt, config)
+    
+    def _record_success(self, generation_time: float):
+        """Update statistics after a successful generation"""
+        self.generation_stats['total_generated'] += 1
+        self.generation_stats['successful'] += 1
+        
+        # Update average generation time
+        total_time = self.generation_stats['average_generation_time'] * (self.generation_stats['total_generated'] - 1)
+        self.generation_stats['average_generation_time'] = (total_time + generation_time) / self.generation_stats['total_generated']
+    
+    def _build_result(
+        self,
+        final_post: str,
+        content: str,
+        prompt: str,
+        config: PostGenerationConfig,
+        generation_time: float
+    ) -> Dict[str, Any]:
+        """Build the result dictionary for a successfully generated post"""
+        return {
+            'post': final_post,
+            'tone': config.tone.value,
+            'generation_time': generation_time,
+            'word_count': len(final_post.split()),
+            'character_count': len(final_post),
+            'config': {
+                'tone': config.tone.value,
+                'max_length': config.max_length,
+                'include_hashtags': config.include_hashtags,
+                'include_emojis': config.include_emojis,
+                'call_to_action': config.call_to_action
+            },
+            'metadata': {
+                'content_length': len(content),
+                'prompt_used': prompt[:100] + "..." if len(prompt) > 100 else prompt,
+                'generation_successful': True,
+                'timestamp': time.time()
+            },
+            'status': 'success'
+        }
+    
     def generate_post(
         self,
         content: str,
@@ -236,21 +339,11 @@ Urgent post:"""
         start_time = time.time()
         
         try:
-            # Validate input
-            if not content or not content.strip():
-                raise ValueError("Content cannot be empty")
+            # Validate, clean and truncate content if necessary
+            content = self._prepare_content(content)
             
-            # Clean and truncate content if necessary
-            content = content.strip()
-            if len(content) > 2000:
-                content = content[:2000] + "..."
-                logger.warning("Content truncated to 2000 characters")
-            
-            # Get tone-specific prompt
-            base_prompt = self.tone_prompts[config.tone].format(content=content)
-            
-            # Enhance prompt with additional context
-            enhanced_prompt = self._enhance_prompt_with_context(base_prompt, config)
+            # Get tone-specific prompt enhanced with additional context
+            enhanced_prompt = self._build_prompt(content, config)
             
             logger.info(f"Generating post with tone: {config.tone.value}")
             
@@ -261,38 +354,11 @@ Urgent post:"""
             final_post = self._post_process_generated_text(generated_text, config)
             
             generation_time = time.time() - start_time
-            
-            # Update statistics
-            self.generation_stats['total_generated'] += 1
-            self.generation_stats['successful'] += 1
-            
-            # Update average generation time
-            total_time = self.generation_stats['average_generation_time'] * (self.generation_stats['total_generated'] - 1)
-            self.generation_stats['average_generation_time'] = (total_time + generation_time) / self.generation_stats['total_generated']
+            self._record_success(generation_time)
             
             logger.info(f"Post generated successfully in {generation_time:.2f} seconds")
             
-            return {
-                'post': final_post,
-                'tone': config.tone.value,
-                'generation_time': generation_time,
-                'word_count': len(final_post.split()),
-                'character_count': len(final_post),
-                'config': {
-                    'tone': config.tone.value,
-                    'max_length': config.max_length,
-                    'include_hashtags': config.include_hashtags,
-                    'include_emojis': config.include_emojis,
-                    'call_to_action': config.call_to_action
-                },
-                'metadata': {
-                    'content_length': len(content),
-                    'prompt_used': enhanced_prompt[:100] + "..." if len(enhanced_prompt) > 100 else enhanced_prompt,
-                    'generation_successful': True,
-                    'timestamp': time.time()
-                },
-                'status': 'success'
-            }
+            return self._build_result(final_post, content, enhanced_prompt, config, generation_time)
             
         except PostGenerationTimeout as e:
             self.generation_stats['total_generated'] += 1
@@ -318,6 +384,93 @@ Urgent post:"""
                 'generation_time': time.time() - start_time
             }
     
+    def generate_posts_batch(
+        self,
+        content: str,
+        configs: List[PostGenerationConfig]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate one post per configuration in a single batched model call
+        
+        Args:
+            content: Source content to create posts from
+            configs: Generation configuration for each post
+            
+        Returns:
+            List of results in the same order as configs
+        """
+        start_time = time.time()
+        
+        try:
+            content = self._prepare_content(content)
+            prompts = [self._build_prompt(content, config) for config in configs]
+            
+            # One generate call covers the batch, so every prompt uses the longest
+            # length and samples if any config does; keys follow those settings
+            max_length = max(config.max_length for config in configs)
+            do_sample = any(config.do_sample for config in configs)
+            
+            # Identical prompts share one generation; cached greedy ones skip the model
+            keys = [cache_key(max_length, prompt) for prompt in prompts]
+            texts = {key: None if do_sample else generation_cache.get(key) for key in keys}
+            missing = {key: prompt for key, prompt in zip(keys, prompts) if texts[key] is None}
+            
+            if missing:
+                logger.info(f"Generating {len(missing)} of {len(prompts)} posts in one batch")
+                
+                future = self.executor.submit(
+                    flan_t5_service.generate_batch,
+                    list(missing.values()),
+                    max_length=max_length,
+                    temperature=0.8,
+                    top_p=0.9,
+                    do_sample=do_sample
+                )
+                timeout = max(config.generation_timeout for config in configs)
+                try:
+                    outputs = future.result(timeout=timeout)
+                except TimeoutError:
+                    future.cancel()
+                    raise PostGenerationTimeout(f"Generation timed out after {timeout} seconds")
+                
+                for key, output in zip(missing, outputs):
+                    texts[key] = output['text']
+                    if not do_sample:
+                        generation_cache.setex(key, DEFAULT_TTL, output['text'])
+            else:
+                logger.info(f"All {len(prompts)} posts served from generation cache")
+            
+            generation_time = time.time() - start_time
+            results = []
+            for config, prompt, key in zip(configs, prompts, keys):
+                final_post = self._post_process_generated_text(texts[key], config)
+                self._record_success(generation_time)
+                results.append(self._build_result(final_post, content, prompt, config, generation_time))
+            
+            logger.info(f"Batch of {len(results)} posts generated in {generation_time:.2f} seconds")
+            return results
+            
+        except PostGenerationTimeout as e:
+            self.generation_stats['total_generated'] += len(configs)
+            self.generation_stats['timeout'] += len(configs)
+            logger.error(f"Post generation timeout: {e}")
+            status = 'timeout'
+            error = e
+            
+        except Exception as e:
+            self.generation_stats['total_generated'] += len(configs)
+            self.generation_stats['failed'] += len(configs)
+            logger.error(f"Batch post generation failed: {e}")
+            status = 'failed'
+            error = e
+        
+        return [{
+            'post': '',
+            'error': str(error),
+            'status': status,
+            'generation_time': time.time() - start_time
+        } for _ in configs]
+    
     def generate_multiple_posts(
         self,
         content: str,
@@ -1,6 +1,7 @@
 import os
 import uuid
 import json
+import hashlib
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import librosa
@@ -11,12 +12,15 @@ logger = logging.getLogger(__name__)
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'ogg', 'flac'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 MAX_DURATION = 600  # 10 minutes
+CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
 
 class AudioUploadHandler:
     def __init__(self, upload_folder="../uploads/audio", data_folder="../uploads/data"):
         self.upload_folder = upload_folder
         self.data_folder = data_folder
         self.audio_files_json = os.path.join(data_folder, "audio_files.json")
+        # Parsed audio_files.json, keyed by the file's (mtime, size) at read time
+        self._metadata_cache = (None, {})
         
         # Ensure directories exist
         os.makedirs(upload_folder, exist_ok=True)
@@ -83,6 +87,21 @@ class AudioUploadHandler:
         except Exception as e:
             return False, f"Could not analyze audio file: {str(e)}"
     
+    def write_file_chunked(self, file, file_path):
+        """Stream upload to disk in fixed-size chunks, hashing as it goes
+        
+        Returns:
+            tuple: (sha256 hex digest, bytes written)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with open(file_path, 'wb') as out:
+            while chunk := file.stream.read(CHUNK_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+    
     def save_audio_file(self, file):
         """Store file securely and return metadata"""
         try:
@@ -101,8 +120,8 @@ class AudioUploadHandler:
             stored_filename = f"{file_id}_{timestamp}_{original_filename}"
             file_path = os.path.abspath(os.path.join(self.upload_folder, stored_filename))
             
-            # Save file
-            file.save(file_path)
+            # Save file (constant memory regardless of upload size)
+            checksum, file_size = self.write_file_chunked(file, file_path)
             
             # Validate audio duration
             duration_valid, duration_error = self.validate_audio_duration(file_path)
@@ -114,7 +133,6 @@ class AudioUploadHandler:
                 }
             
             # Get file metadata
-            file_size = os.path.getsize(file_path)
             duration = librosa.get_duration(path=file_path)
             
             # Save metadata to JSON
@@ -124,6 +142,7 @@ class AudioUploadHandler:
                 'stored_filename': stored_filename,
                 'file_path': file_path,
                 'size': file_size,
+                'sha256': checksum,
                 'duration': duration,
                 'format': original_filename.rsplit('.', 1)[1].lower(),
                 'uploaded_at': datetime.now().isoformat(),
@@ -140,6 +159,7 @@ class AudioUploadHandler:
             # Save back to JSON
             with open(self.audio_files_json, 'w') as f:
                 json.dump(audio_files, f, indent=2)
+            self._invalidate_metadata_cache()
             
             logger.info(f"Audio file uploaded successfully: {file_id}")
             
@@ -170,18 +190,33 @@ class AudioUploadHandler:
             
             with open(self.audio_files_json, 'w') as f:
                 json.dump(audio_files, f, indent=2)
+            self._invalidate_metadata_cache()
             
             return True
         except Exception as e:
             logger.error(f"Error saving file metadata: {str(e)}")
             return False
     
+    def _load_audio_files(self):
+        """Return parsed audio_files.json, re-reading only when the file changed"""
+        stat = os.stat(self.audio_files_json)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached_key, audio_files = self._metadata_cache
+        if cached_key != key:
+            with open(self.audio_files_json, 'r') as f:
+                audio_files = json.load(f)
+            self._metadata_cache = (key, audio_files)
+        return audio_files
+    
+    def _invalidate_metadata_cache(self):
+        """Drop cached metadata after this handler rewrites audio_files.json"""
+        self._metadata_cache = (None, {})
+    
     def get_file_metadata(self, file_id):
         """Get file metadata by ID"""
         try:
-            with open(self.audio_files_json, 'r') as f:
-                audio_files = json.load(f)
-            return audio_files.get(file_id)
+            metadata = self._load_audio_files().get(file_id)
+            return dict(metadata) if metadata is not None else None
         except Exception as e:
             logger.error(f"Error reading file metadata: {str(e)}")
             return None
@@ -211,6 +246,7 @@ class AudioUploadHandler:
                 
                 with open(self.audio_files_json, 'w') as f:
                     json.dump(audio_files, f, indent=2)
+                self._invalidate_metadata_cache()
             
             logger.info(f"File deleted successfully: {file_id}")
             return {
@@ -0,0 +1,92 @@
+"""Dynamic batching for Whisper transcription jobs.
+
+Concurrent ``/api/transcribe`` requests are collected for up to
+``MAX_WAIT_MS`` (or until ``BATCH_SIZE`` jobs are waiting) and handed to
+:meth:`WhisperService.transcribe_batch` in one call, so the encoder weights are
+streamed once per batch instead of once per file.  Results are delivered back
+through :class:`concurrent.futures.Future` objects.  Without the WhisperS2T
+backend there is nothing to batch, so callers should use the worker pool
+instead (see :attr:`WhisperService.supports_batching`); a batcher that still
+receives jobs transcribes them one by one.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+MAX_WAIT_MS = int(os.getenv("WHISPER_BATCH_MAX_WAIT_MS", "50"))
+
+
+class WhisperBatcher(threading.Thread):
+    """Background thread that groups queued transcription jobs into batches."""
+
+    def __init__(self, whisper_service, *, batch_size: int = BATCH_SIZE, max_wait_ms: int = MAX_WAIT_MS) -> None:
+        super().__init__(daemon=True)
+        self.whisper_service = whisper_service
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._stop_event = threading.Event()
+
+    def submit(self, file_path: str) -> Future:
+        """Queue *file_path* for transcription and return a future for the result."""
+        future: Future = Future()
+        self._queue.put((file_path, future))
+        return future
+
+    def _collect(self, first: Tuple[str, Future]) -> List[Tuple[str, Future]]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Drop jobs whose caller already gave up
+        return [(path, fut) for path, fut in batch if fut.set_running_or_notify_cancel()]
+
+    def _transcribe_each(self, batch: List[Tuple[str, Future]]) -> None:
+        """Transcribe files one at a time, resolving each future as soon as its file is done."""
+        for path, fut in batch:
+            try:
+                fut.set_result(self.whisper_service.transcribe_audio(path))
+            except Exception as exc:  # pragma: no cover
+                logger.exception("WhisperBatcher: transcription failed for %s – %s", path, exc)
+                fut.set_exception(exc)
+
+    def run(self) -> None:  # noqa: D401
+        logger.info("WhisperBatcher started – batch size %s, max wait %s ms", self.batch_size, int(self.max_wait * 1000))
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            batch = self._collect(first)
+            if not batch:
+                continue
+            if len(batch) == 1 or not self.whisper_service.supports_batching:
+                self._transcribe_each(batch)
+                continue
+            logger.info("WhisperBatcher: transcribing batch of %s file(s)", len(batch))
+            try:
+                results = self.whisper_service.transcribe_batch([path for path, _ in batch])
+            except Exception as exc:
+                logger.warning("WhisperBatcher: batch failed, transcribing files one by one – %s", exc)
+                self._transcribe_each(batch)
+                continue
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -1,14 +1,27 @@
-import whisper
+import copy
 import os
-import json
 import uuid
 import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pydub import AudioSegment
 from pydub.effects import normalize
 import librosa
 import numpy as np
+import orjson
+import soundfile as sf
+import torch
+from faster_whisper import WhisperModel, decode_audio
 from pathlib import Path
+from services.whisper_features import CachedFeatureExtractor, GPUFeatureExtractor
+
+try:
+    import whisper_s2t  # Optional batched backend (VAD chunking + dynamic batching)
+except ImportError:
+    whisper_s2t = None
 
 # Configure FFmpeg for pydub
 current_dir = Path(__file__).parent.parent
@@ -20,6 +33,44 @@ if ffmpeg_path.exists():
 
 logger = logging.getLogger(__name__)
 
+# CTranslate2 quantisation used for the Whisper weights; int8 GEMMs on CPU,
+# int8 weights with fp16 activations on GPU.
+DEFAULT_COMPUTE_TYPES = {'cuda': 'int8_float16', 'cpu': 'int8'}
+
+# Whisper's expected input rate, and the peak pydub's normalize() targets (0.1 dB headroom)
+SAMPLE_RATE = 16000
+NORMALIZE_PEAK = 10 ** (-0.1 / 20)
+
+# Transcriptions JSON stays indented for hand inspection; numpy scalars from
+# confidence maths serialise as plain numbers
+STORAGE_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+
+@contextmanager
+def _atomic_output(path):
+    """Yield a unique temp path next to *path*, moved over it once the block succeeds"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _write_json(path, data):
+    # Readers cache the parsed file, so they must never see it half-written
+    with _atomic_output(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=STORAGE_JSON_OPTIONS))
+
 class WhisperService:
     def __init__(self, model_name="base"):
         """
@@ -30,6 +81,16 @@ class WhisperService:
         """
         self.model_name = model_name
         self.model = None
+        self.batch_model = None
+        self._loading_lock = threading.Lock()
+        # Serialises read-modify-write cycles on the transcriptions JSON file
+        self._storage_lock = threading.Lock()
+        # Parsed transcriptions JSON, keyed by the file's (mtime, size) at read time
+        self._transcriptions_cache = (None, {})
+        self._cache_lock = threading.Lock()
+        # Results queued by save_transcription_async, readable until written
+        self._unsaved = {}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcription-writer")
         # Use absolute path to uploads directory
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         parent_dir = os.path.dirname(base_dir)
@@ -40,20 +101,36 @@ class WhisperService:
         
         # Ensure JSON file exists
         if not os.path.exists(self.transcriptions_json):
-            with open(self.transcriptions_json, 'w') as f:
-                json.dump({}, f)
+            _write_json(self.transcriptions_json, {})
     
     def load_whisper_model(self):
         """
         Load Whisper model once and cache it.
         
+        Uses the CTranslate2-based faster-whisper backend with quantised
+        weights (see ``DEFAULT_COMPUTE_TYPES``, overridable through the
+        ``WHISPER_COMPUTE_TYPE`` environment variable). On CUDA the Mel
+        spectrogram is also computed on the GPU.
+        
         Returns:
-            whisper.Whisper: Loaded Whisper model
+            faster_whisper.WhisperModel: Loaded Whisper model
         """
-        if self.model is None:
+        if self.model is not None:
+            return self.model
+        with self._loading_lock:
+            if self.model is not None:
+                return self.model
             try:
-                logger.info(f"Loading Whisper model: {self.model_name}")
-                self.model = whisper.load_model(self.model_name)
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                compute_type = os.getenv('WHISPER_COMPUTE_TYPE', DEFAULT_COMPUTE_TYPES[device])
+                logger.info(f"Loading Whisper model: {self.model_name} ({device}, {compute_type})")
+                model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
+                if device == "cuda":
+                    # Compute log-Mel features with torch.stft on the GPU
+                    model.feature_extractor = GPUFeatureExtractor(device=device, **model.feat_kwargs)
+                # Allow features precomputed at upload time to be passed in
+                model.feature_extractor = CachedFeatureExtractor(model.feature_extractor)
+                self.model = model
                 logger.info(f"Whisper model {self.model_name} loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load Whisper model: {str(e)}")
@@ -71,25 +148,13 @@ class WhisperService:
             str: Path to preprocessed audio file
         """
         try:
-            # Load audio file with pydub
-            audio = AudioSegment.from_file(file_path)
-            
-            # Convert to mono if stereo
-            if audio.channels > 1:
-                audio = audio.set_channels(1)
-            
-            # Normalize audio
-            audio = normalize(audio)
-            
-            # Set sample rate to 16kHz (Whisper's preferred rate)
-            audio = audio.set_frame_rate(16000)
-            
-            # Export preprocessed audio
-            preprocessed_path = os.path.join(
-                os.path.dirname(file_path), 
-                os.path.basename(file_path).replace('.', '_preprocessed.')
-            )
-            audio.export(preprocessed_path, format="wav")
+            # Export preprocessed audio (atomically, upload precompute may race transcription)
+            preprocessed_path = self._preprocessed_path(file_path)
+            with _atomic_output(preprocessed_path) as tmp_path:
+                if os.getenv('AUDIO_DECODER', 'pyav') == 'pydub':
+                    self._preprocess_with_pydub(file_path, tmp_path)
+                else:
+                    self._preprocess_with_pyav(file_path, tmp_path)
             
             logger.info(f"Audio preprocessed: {preprocessed_path}")
             return preprocessed_path
@@ -98,6 +163,85 @@ class WhisperService:
             logger.warning(f"Audio preprocessing failed, using original file: {str(e)}")
             return file_path
     
+    @staticmethod
+    def _preprocess_with_pyav(file_path, output_path):
+        """Decode in-process with PyAV to 16 kHz mono, peak-normalise and write a 16-bit WAV"""
+        audio = decode_audio(file_path, sampling_rate=SAMPLE_RATE)
+        peak = np.abs(audio).max() if audio.size else 0.0
+        if peak > 0:
+            audio = audio * (NORMALIZE_PEAK / peak)
+        sf.write(output_path, audio, SAMPLE_RATE, subtype='PCM_16', format='WAV')
+    
+    @staticmethod
+    def _preprocess_with_pydub(file_path, output_path):
+        """Same preprocessing through pydub, which shells out to ffmpeg"""
+        audio = AudioSegment.from_file(file_path)
+        
+        # Convert to mono if stereo
+        if audio.channels > 1:
+            audio = audio.set_channels(1)
+        
+        # Normalize audio
+        audio = normalize(audio)
+        
+        # Set sample rate to 16kHz (Whisper's preferred rate)
+        audio = audio.set_frame_rate(SAMPLE_RATE)
+        audio.export(output_path, format="wav")
+    
+    @staticmethod
+    def _preprocessed_path(file_path):
+        """Path of the preprocessed WAV written next to *file_path*"""
+        return os.path.join(
+            os.path.dirname(file_path), 
+            os.path.basename(file_path).replace('.', '_preprocessed.')
+        )
+    
+    @staticmethod
+    def _features_path(file_path):
+        """Path of the cached log-Mel features written next to *file_path*"""
+        return os.path.splitext(WhisperService._preprocessed_path(file_path))[0] + '_features.npy'
+    
+    def precompute_features(self, file_path):
+        """
+        Preprocess audio and cache its log-Mel features, ahead of transcription.
+        
+        Features are stored as float16 next to the audio file and picked up
+        by transcribe_audio, which then skips the feature extractor.
+        
+        Args:
+            file_path (str): Path to the uploaded audio file
+            
+        Returns:
+            str: Path to cached features file
+        """
+        feature_extractor = self.load_whisper_model().feature_extractor
+        preprocessed_path = self.preprocess_audio(file_path)
+        audio = decode_audio(preprocessed_path, sampling_rate=feature_extractor.sampling_rate)
+        features = feature_extractor.extractor(audio)
+        
+        features_path = self._features_path(file_path)
+        with _atomic_output(features_path) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, features.astype(np.float16))
+        
+        logger.info(f"Features precomputed: {features_path}")
+        return features_path
+    
+    def load_cached_features(self, file_path):
+        """
+        Load features cached by precompute_features.
+        
+        Args:
+            file_path (str): Path to the uploaded audio file
+            
+        Returns:
+            numpy.ndarray: float32 features, or None when not cached
+        """
+        features_path = self._features_path(file_path)
+        if not os.path.exists(features_path) or not os.path.exists(self._preprocessed_path(file_path)):
+            return None
+        return np.load(features_path).astype(np.float32)
+    
     def get_transcription_confidence(self, result):
         """
         Extract confidence scores from Whisper transcription result.
@@ -151,7 +295,32 @@ class WhisperService:
                 'segment_count': 0
             }
     
-    def transcribe_audio(self, file_path, language=None, task="transcribe"):
+    @staticmethod
+    def _segment_to_dict(segment):
+        """
+        Convert a faster-whisper segment into the JSON-serialisable dict
+        layout used by the reference Whisper implementation.
+        
+        Args:
+            segment (faster_whisper.transcribe.Segment): Decoded segment
+            
+        Returns:
+            dict: Segment data
+        """
+        return {
+            'id': segment.id,
+            'seek': segment.seek,
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text,
+            'tokens': segment.tokens,
+            'temperature': segment.temperature,
+            'avg_logprob': segment.avg_logprob,
+            'compression_ratio': segment.compression_ratio,
+            'no_speech_prob': segment.no_speech_prob
+        }
+    
+    def transcribe_audio(self, file_path, language=None, task="transcribe", on_segment=None):
         """
         Main transcription function with preprocessing and confidence scoring.
         
@@ -159,76 +328,234 @@ class WhisperService:
             file_path (str): Path to audio file
             language (str): Language code (auto-detect if None)
             task (str): 'transcribe' or 'translate'
+            on_segment (callable): Called with each segment dict as it is decoded
             
         Returns:
             dict: Transcription result with metadata
         """
         try:
-            logger.info(f"[TRANSCRIBE] Starting transcription for: {file_path}")
+            logger.info("[TRANSCRIBE] Starting transcription for: %s", file_path)
             
             # Load model
-            logger.info(f"[TRANSCRIBE] Loading model: {self.model_name}")
+            logger.debug("[TRANSCRIBE] Loading model: %s", self.model_name)
             model = self.load_whisper_model()
             
-            # Preprocess audio
-            logger.info(f"[TRANSCRIBE] Preprocessing audio...")
-            preprocessed_path = self.preprocess_audio(file_path)
+            # Reuse audio and features precomputed at upload, else preprocess now
+            features = self.load_cached_features(file_path)
+            if features is not None:
+                logger.debug("[TRANSCRIBE] Using precomputed features")
+                preprocessed_path = self._preprocessed_path(file_path)
+            else:
+                logger.debug("[TRANSCRIBE] Preprocessing audio...")
+                preprocessed_path = self.preprocess_audio(file_path)
             
             # Transcribe audio with optimized settings
-            logger.info(f"[TRANSCRIBE] Running Whisper inference...")
+            logger.debug("[TRANSCRIBE] Running Whisper inference...")
             start_time = datetime.now()
             
-            result = model.transcribe(
-                preprocessed_path,
-                language=language,
-                task=task,
-                word_timestamps=False,  # Disable for speed
-                verbose=False,
-                temperature=0,  # Deterministic output for speed
-                beam_size=1,   # Single beam for speed
-                best_of=1      # Single candidate for speed
-            )
+            with model.feature_extractor.use(features):
+                segments, info = model.transcribe(
+                    preprocessed_path,
+                    language=language,
+                    task=task,
+                    word_timestamps=False,  # Disable for speed
+                    without_timestamps=True,  # Text only, skips timestamp tokens
+                    temperature=0,  # Deterministic output for speed
+                    beam_size=1,   # Single beam for speed
+                    best_of=1      # Single candidate for speed
+                )
+                
+                # Segments are decoded lazily; consuming the generator runs inference
+                decoded = []
+                for segment in segments:
+                    segment = self._segment_to_dict(segment)
+                    decoded.append(segment)
+                    if on_segment is not None:
+                        on_segment(segment)
+                segments = decoded
+            result = {
+                'text': ''.join(segment['text'] for segment in segments),
+                'language': info.language,
+                'segments': segments
+            }
             
-            logger.info(f"[TRANSCRIBE] Whisper inference completed")
+            logger.debug("[TRANSCRIBE] Whisper inference completed")
             
             end_time = datetime.now()
             processing_time = (end_time - start_time).total_seconds()
             
-            # Get confidence scores
-            confidence_metrics = self.get_transcription_confidence(result)
-            
-            # Produce transcription result
-            transcription_result = {
-                'transcription_id': str(uuid.uuid4()),
-                'text': result['text'].strip(),
-                'language': result.get('language', 'unknown'),
-                'confidence_metrics': confidence_metrics,
-                'processing_time': processing_time,
-                'model_used': self.model_name,
-                'task': task,
-                'segments': result.get('segments', []),
-                'transcribed_at': datetime.now().isoformat(),
-                'status': 'completed'
-            }
+            transcription_result = self._build_transcription_result(result, processing_time, task)
             
-            logger.info(f"Transcription completed in {processing_time:.2f}s")
+            logger.info("Transcription completed in %.2fs", processing_time)
             return transcription_result
             
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}")
-            return {
-                'transcription_id': str(uuid.uuid4()),
-                'text': '',
-                'language': 'unknown',
-                'confidence_metrics': {'overall_confidence': 0.0, 'word_confidence': 0.0, 'segment_count': 0},
-                'processing_time': 0.0,
-                'model_used': self.model_name,
-                'task': task,
-                'segments': [],
-                'transcribed_at': datetime.now().isoformat(),
-                'status': 'failed',
-                'error': str(e)
-            }
+            return self._failed_transcription_result(e, task)
+    
+    @property
+    def supports_batching(self):
+        """Whether transcribe_batch has a batched backend (WhisperS2T) to call"""
+        return whisper_s2t is not None
+    
+    def load_batch_model(self):
+        """
+        Load the WhisperS2T batched model once and cache it.
+        
+        Returns:
+            WhisperS2T model, or None when whisper_s2t is not installed
+        """
+        if self.batch_model is not None or whisper_s2t is None:
+            return self.batch_model
+        with self._loading_lock:
+            if self.batch_model is not None:
+                return self.batch_model
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            compute_type = os.getenv('WHISPER_COMPUTE_TYPE', DEFAULT_COMPUTE_TYPES[device])
+            logger.info(f"Loading WhisperS2T batch model: {self.model_name} ({device}, {compute_type})")
+            self.batch_model = whisper_s2t.load_model(
+                model_identifier=self.model_name,
+                backend='CTranslate2',
+                device=device,
+                compute_type=compute_type
+            )
+        return self.batch_model
+    
+    def transcribe_batch(self, file_paths, language=None, task="transcribe"):
+        """
+        Transcribe several audio files in a single batched model call.
+        
+        Uses WhisperS2T (VAD chunking + CTranslate2 backend) when it is
+        installed; otherwise each file goes through transcribe_audio.
+        
+        Args:
+            file_paths (list): Paths to audio files
+            language (str): Language code; WhisperS2T does not auto-detect,
+                so this defaults to the WHISPER_LANGUAGE environment variable
+            task (str): 'transcribe' or 'translate'
+            
+        Returns:
+            list: Transcription results in the same order as file_paths
+        """
+        if whisper_s2t is None or len(file_paths) == 1:
+            return [self.transcribe_audio(path, language, task) for path in file_paths]
+        
+        try:
+            model = self.load_batch_model()
+            preprocessed_paths = [self.preprocess_audio(path) for path in file_paths]
+            language = language or os.getenv('WHISPER_LANGUAGE', 'en')
+            
+            start_time = datetime.now()
+            outputs = model.transcribe_with_vad(
+                preprocessed_paths,
+                lang_codes=[language] * len(preprocessed_paths),
+                tasks=[task] * len(preprocessed_paths),
+                initial_prompts=[None] * len(preprocessed_paths),
+                batch_size=len(preprocessed_paths)
+            )
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logger.info(f"Batch of {len(file_paths)} files transcribed in {processing_time:.2f}s")
+            
+            results = []
+            for utterances in outputs:
+                segments = [{
+                    'id': idx,
+                    'start': utterance.get('start_time'),
+                    'end': utterance.get('end_time'),
+                    'text': utterance['text'],
+                    'avg_logprob': utterance.get('avg_logprob'),
+                    'no_speech_prob': utterance.get('no_speech_prob')
+                } for idx, utterance in enumerate(utterances)]
+                result = {
+                    'text': ' '.join(segment['text'].strip() for segment in segments),
+                    'language': language,
+                    'segments': segments
+                }
+                results.append(self._build_transcription_result(result, processing_time, task))
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch transcription failed: {str(e)}")
+            return [self._failed_transcription_result(e, task) for _ in file_paths]
+    
+    def _build_transcription_result(self, result, processing_time, task):
+        """
+        Produce the stored transcription record from raw model output.
+        
+        Args:
+            result (dict): Raw output with 'text', 'language' and 'segments'
+            processing_time (float): Inference time in seconds
+            task (str): 'transcribe' or 'translate'
+            
+        Returns:
+            dict: Transcription result with metadata
+        """
+        # Get confidence scores
+        confidence_metrics = self.get_transcription_confidence(result)
+        
+        return {
+            'transcription_id': str(uuid.uuid4()),
+            'text': result['text'].strip(),
+            'language': result.get('language', 'unknown'),
+            'confidence_metrics': confidence_metrics,
+            'processing_time': processing_time,
+            'model_used': self.model_name,
+            'task': task,
+            'segments': result.get('segments', []),
+            'transcribed_at': datetime.now().isoformat(),
+            'status': 'completed'
+        }
+    
+    def _failed_transcription_result(self, error, task):
+        """
+        Produce the stored transcription record for a failed transcription.
+        
+        Args:
+            error (Exception): Failure cause
+            task (str): 'transcribe' or 'translate'
+            
+        Returns:
+            dict: Transcription result with status 'failed'
+        """
+        return {
+            'transcription_id': str(uuid.uuid4()),
+            'text': '',
+            'language': 'unknown',
+            'confidence_metrics': {'overall_confidence': 0.0, 'word_confidence': 0.0, 'segment_count': 0},
+            'processing_time': 0.0,
+            'model_used': self.model_name,
+            'task': task,
+            'segments': [],
+            'transcribed_at': datetime.now().isoformat(),
+            'status': 'failed',
+            'error': str(error)
+        }
+    
+    def create_pending_transcription(self, file_id, task="transcribe"):
+        """
+        Reserve a transcription record before the job runs, so clients can poll it.
+        
+        Args:
+            file_id (str): Original file ID
+            task (str): 'transcribe' or 'translate'
+            
+        Returns:
+            dict: Saved transcription record with status 'pending'
+        """
+        pending = {
+            'transcription_id': str(uuid.uuid4()),
+            'text': '',
+            'language': 'unknown',
+            'confidence_metrics': {'overall_confidence': 0.0, 'word_confidence': 0.0, 'segment_count': 0},
+            'processing_time': 0.0,
+            'model_used': self.model_name,
+            'task': task,
+            'segments': [],
+            'transcribed_at': None,
+            'status': 'pending'
+        }
+        self.save_transcription(file_id, pending)
+        return pending
     
     def save_transcription(self, file_id, transcription_result):
         """
@@ -239,19 +566,19 @@ class WhisperService:
             transcription_result (dict): Transcription result
         """
         try:
-            # Read existing transcriptions
-            with open(self.transcriptions_json, 'r') as f:
-                transcriptions = json.load(f)
-            
-            # Add file_id to transcription result
-            transcription_result['file_id'] = file_id
-            
-            # Save transcription
-            transcriptions[transcription_result['transcription_id']] = transcription_result
-            
-            # Write back to file
-            with open(self.transcriptions_json, 'w') as f:
-                json.dump(transcriptions, f, indent=2)
+            with self._storage_lock:
+                # Read existing transcriptions
+                transcriptions = _read_json(self.transcriptions_json)
+                
+                # Add file_id to transcription result
+                transcription_result['file_id'] = file_id
+                
+                # Save transcription
+                transcriptions[transcription_result['transcription_id']] = transcription_result
+                
+                # Write back to file
+                _write_json(self.transcriptions_json, transcriptions)
+                self._invalidate_transcriptions_cache()
             
             logger.info(f"Transcription saved: {transcription_result['transcription_id']}")
             
@@ -259,6 +586,46 @@ class WhisperService:
             logger.error(f"Error saving transcription: {str(e)}")
             raise
     
+    def save_transcription_async(self, file_id, transcription_result):
+        """
+        Queue a transcription result for saving on a background writer thread.
+        
+        The result is served by get_transcription until the write completes.
+        
+        Args:
+            file_id (str): Original file ID
+            transcription_result (dict): Transcription result
+            
+        Returns:
+            Future: Completes once the result is on disk
+        """
+        transcription_id = transcription_result['transcription_id']
+        transcription_result['file_id'] = file_id
+        self._unsaved[transcription_id] = transcription_result
+        future = self._writer.submit(self.save_transcription, file_id, transcription_result)
+        future.add_done_callback(lambda _: self._unsaved.pop(transcription_id, None))
+        return future
+    
+    def _load_transcriptions(self):
+        """
+        Return parsed transcriptions JSON, re-reading only when the file changed.
+        
+        The returned dict is shared with other readers; callers copy what they hand out.
+        """
+        with self._cache_lock:
+            stat = os.stat(self.transcriptions_json)
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached_key, transcriptions = self._transcriptions_cache
+            if cached_key != key:
+                transcriptions = _read_json(self.transcriptions_json)
+                self._transcriptions_cache = (key, transcriptions)
+            return transcriptions
+    
+    def _invalidate_transcriptions_cache(self):
+        """Drop cached transcriptions after this service rewrites the JSON file"""
+        with self._cache_lock:
+            self._transcriptions_cache = (None, {})
+    
     def get_transcription(self, transcription_id):
         """
         Get transcription by ID.
@@ -269,10 +636,12 @@ class WhisperService:
         Returns:
             dict: Transcription data or None
         """
+        transcription = self._unsaved.get(transcription_id)
         try:
-            with open(self.transcriptions_json, 'r') as f:
-                transcriptions = json.load(f)
-            return transcriptions.get(transcription_id)
+            if transcription is None:
+                transcription = self._load_transcriptions().get(transcription_id)
+            # Callers update the result in place; keep the cached copy intact
+            return copy.deepcopy(transcription) if transcription is not None else None
         except Exception as e:
             logger.error(f"Error reading transcription: {str(e)}")
             return None
@@ -288,13 +657,12 @@ class WhisperService:
             list: List of transcriptions for the file
         """
         try:
-            with open(self.transcriptions_json, 'r') as f:
-                transcriptions = json.load(f)
+            transcriptions = self._load_transcriptions()
             
             file_transcriptions = []
             for transcription_id, transcription_data in transcriptions.items():
                 if transcription_data.get('file_id') == file_id:
-                    file_transcriptions.append(transcription_data)
+                    file_transcriptions.append(copy.deepcopy(transcription_data))
             
             return file_transcriptions
         except Exception as e:
@@ -313,23 +681,23 @@ class WhisperService:
             bool: True if successful, False otherwise
         """
         try:
-            # Read existing transcriptions
-            with open(self.transcriptions_json, 'r') as f:
-                transcriptions = json.load(f)
-            
-            # Check if transcription exists
-            if transcription_id not in transcriptions:
-                logger.error(f"Transcription {transcription_id} not found")
-                return False
-            
-            # Update the text and add edit timestamp
-            transcriptions[transcription_id]['text'] = new_text
-            transcriptions[transcription_id]['edited'] = True
-            transcriptions[transcription_id]['edited_at'] = datetime.now().isoformat()
-            
-            # Write back to file
-            with open(self.transcriptions_json, 'w') as f:
-                json.dump(transcriptions, f, indent=2)
+            with self._storage_lock:
+                # Read existing transcriptions
+                transcriptions = _read_json(self.transcriptions_json)
+                
+                # Check if transcription exists
+                if transcription_id not in transcriptions:
+                    logger.error(f"Transcription {transcription_id} not found")
+                    return False
+                
+                # Update the text and add edit timestamp
+                transcriptions[transcription_id]['text'] = new_text
+                transcriptions[transcription_id]['edited'] = True
+                transcriptions[transcription_id]['edited_at'] = datetime.now().isoformat()
+                
+                # Write back to file
+                _write_json(self.transcriptions_json, transcriptions)
+                self._invalidate_transcriptions_cache()
             
             logger.info(f"Transcription {transcription_id} updated successfully")
             return True
@@ -1,5 +1,8 @@
 # Platform Templates for Social Media Post Generation
 
+from functools import lru_cache
+from typing import Callable
+
 PLATFORM_TEMPLATES = {
     "linkedin": {
         "professional": "Create a professional LinkedIn post about: {content}. Use business language, include insights, and add 2-3 relevant hashtags. Keep it engaging and valuable.",
@@ -21,6 +24,7 @@ PLATFORM_TEMPLATES = {
     }
 }
 
+@lru_cache(maxsize=None)
 def get_template(platform: str, tone: str) -> str:
     """
     Retrieve the template for a specific platform and tone.
@@ -39,3 +43,26 @@ def get_template(platform: str, tone: str) -> str:
         return PLATFORM_TEMPLATES[platform][tone]
     except KeyError as e:
         raise ValueError(f"Template not found for platform {platform} with tone {tone}: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_formatter(platform: str, tone: str) -> Callable[..., str]:
+    """
+    Retrieve a filler for a platform/tone template, split once at ``{content}``.
+
+    Args:
+        platform: The social media platform
+        tone: The tone of the post
+
+    Returns:
+        Callable taking ``content=...`` and returning the filled-in prompt.
+
+    Raises:
+        ValueError: If the platform or tone is not recognized.
+    """
+    prefix, suffix = get_template(platform, tone).split("{content}", 1)
+
+    def fill(content: str) -> str:
+        return prefix + content + suffix
+
+    return fill
@@ -22,7 +22,7 @@ try:
     print("✅ Transformers imported successfully")
     
     print("Testing Whisper...")
-    import whisper
+    from faster_whisper import WhisperModel
     print("✅ Whisper imported successfully")
     
     print("Testing audio libraries...")
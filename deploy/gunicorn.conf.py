@@ -1,10 +1,24 @@
 # Gunicorn configuration file for AI Social Media Post Generator
 import multiprocessing
+import os
+
+import psutil
+
+# CPU inference thread pinning, applied in the master before workers import torch
+_physical_cores = psutil.cpu_count(logical=False) or multiprocessing.cpu_count()
+os.environ.setdefault("OMP_NUM_THREADS", str(_physical_cores))
+os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
 
 bind = "127.0.0.1:5000"
-workers = max(int(multiprocessing.cpu_count() * 2 + 1), 4)
-worker_class = "sync"
-keepalive = 2
+# Each worker process loads its own Whisper and FLAN-T5 weights, and CTranslate2
+# and CUDA state cannot be shared across fork, so scale with threads instead
+workers = int(os.getenv("GUNICORN_WORKERS", 2))
+# Threaded workers: while one request awaits a model job in the worker pool,
+# the same process (and its loaded models) keeps serving other requests
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+# Keep idle client connections open across polling requests
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
 timeout = 300
 max_requests = 1000
 max_requests_jitter = 100
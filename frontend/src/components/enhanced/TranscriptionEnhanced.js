@@ -68,7 +68,22 @@ const TranscriptionEnhanced = ({
         throw new Error('Transcription failed');
       }
 
-      const result = await response.json();
+      // Transcription is queued (202); poll until it completes
+      let { transcription_id: transcriptionId, status } = await response.json();
+      let result;
+      while (status === 'pending') {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const statusResponse = await fetch(`http://216.48.181.216:5000/api/transcription/${transcriptionId}`);
+        if (!statusResponse.ok) {
+          throw new Error('Transcription failed');
+        }
+        result = await statusResponse.json();
+        status = result.status;
+      }
+
+      if (status !== 'completed') {
+        throw new Error(result?.error || 'Transcription failed');
+      }
       
       setTranscription(result);
       setConfidence(result.confidence || 0);
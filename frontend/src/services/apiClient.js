@@ -6,9 +6,13 @@ const API_BASE = process.env.REACT_APP_API_URL || 'http://localhost:5000';
 axios.defaults.baseURL = API_BASE;
 axios.defaults.timeout = 30000; // 30 seconds timeout
 
+const TRANSCRIPTION_POLL_INTERVAL = 2000; // 2 seconds between status polls
+
 class ApiClient {
   constructor() {
     this.baseURL = API_BASE;
+    // Last transcription payload per id with its ETag, for conditional polls
+    this.transcriptionCache = new Map();
   }
 
   /**
@@ -48,7 +52,7 @@ class ApiClient {
   }
 
   /**
-   * Start transcription process
+   * Start transcription process and wait for it to finish
    * @param {string} fileId - ID of uploaded file
    * @returns {Promise<Object>} Transcription result
    */
@@ -58,10 +62,8 @@ class ApiClient {
         file_id: fileId,
       });
 
-      return {
-        success: true,
-        data: response.data,
-      };
+      // The backend queues the job (202) and returns the id to poll
+      return await this.waitForTranscription(response.data.transcription_id);
     } catch (error) {
       console.error('Transcription error:', error);
       return {
@@ -71,6 +73,31 @@ class ApiClient {
     }
   }
 
+  /**
+   * Poll transcription status until it is no longer pending
+   * @param {string} transcriptionId - ID of transcription
+   * @param {number} interval - Delay between polls in milliseconds
+   * @returns {Promise<Object>} Transcription result
+   */
+  async waitForTranscription(transcriptionId, interval = TRANSCRIPTION_POLL_INTERVAL) {
+    for (;;) {
+      const result = await this.getTranscriptionStatus(transcriptionId);
+      if (!result.success) {
+        return result;
+      }
+      if (result.data.status === 'failed') {
+        return {
+          success: false,
+          error: result.data.error || 'Transcription failed',
+        };
+      }
+      if (result.data.status !== 'pending') {
+        return result;
+      }
+      await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+  }
+
   /**
    * Get transcription status and result
    * @param {string} transcriptionId - ID of transcription
@@ -78,7 +105,24 @@ class ApiClient {
    */
   async getTranscriptionStatus(transcriptionId) {
     try {
-      const response = await axios.get(`/api/transcription/${transcriptionId}`);
+      const cached = this.transcriptionCache.get(transcriptionId);
+      const response = await axios.get(`/api/transcription/${transcriptionId}`, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+      });
+
+      if (response.status === 304 && cached) {
+        return {
+          success: true,
+          data: cached.data,
+        };
+      }
+      if (response.headers.etag) {
+        this.transcriptionCache.set(transcriptionId, {
+          etag: response.headers.etag,
+          data: response.data,
+        });
+      }
 
       return {
         success: true,
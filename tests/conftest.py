@@ -0,0 +1,10 @@
+"""Shared pytest setup: backend modules are imported the way the app imports them."""
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# Locust script run by hand against a deployment, not a pytest module
+collect_ignore = ["load_test.py"]
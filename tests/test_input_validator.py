@@ -0,0 +1,60 @@
+"""Upload path and audio-signature checks in security.input_validator."""
+import pytest
+
+from security.input_validator import sniff_audio_mime, validate_audio_header, validate_upload_path
+
+
+def test_upload_path_inside_dir(tmp_path):
+    assert validate_upload_path(str(tmp_path), "clip.wav") == tmp_path.resolve() / "clip.wav"
+
+
+@pytest.mark.parametrize("filename", ["../clip.wav", "../../etc/passwd", "/etc/passwd"])
+def test_upload_path_traversal_rejected(tmp_path, filename):
+    upload_dir = tmp_path / "audio"
+    upload_dir.mkdir()
+    with pytest.raises(ValueError):
+        validate_upload_path(str(upload_dir), filename)
+
+
+def test_upload_path_sibling_with_shared_prefix_rejected(tmp_path):
+    # A string prefix check would accept /uploads/audio-evil for /uploads/audio
+    upload_dir = tmp_path / "audio"
+    upload_dir.mkdir()
+    with pytest.raises(ValueError):
+        validate_upload_path(str(upload_dir), "../audio-evil/clip.wav")
+
+
+def test_upload_path_symlink_escape_rejected(tmp_path):
+    upload_dir = tmp_path / "audio"
+    upload_dir.mkdir()
+    (upload_dir / "link").symlink_to(tmp_path)
+    with pytest.raises(ValueError):
+        validate_upload_path(str(upload_dir), "link/clip.wav")
+
+
+@pytest.mark.parametrize("header, mime", [
+    (b"RIFF\x24\x08\x00\x00WAVEfmt ", "audio/x-wav"),
+    (b"fLaC\x00\x00\x00\x22", "audio/flac"),
+    (b"OggS\x00\x02", "audio/ogg"),
+    (b"ID3\x04\x00\x00", "audio/mpeg"),
+    (b"\xff\xfb\x90\x64", "audio/mpeg"),  # MPEG-1 Layer III frame sync
+])
+def test_sniff_known_audio_signatures(header, mime):
+    assert sniff_audio_mime(header) == mime
+    validate_audio_header(header + bytes(64))
+
+
+@pytest.mark.parametrize("header", [
+    b"\xff\xf1\x50\x80",  # AAC ADTS: frame sync but layer bits zero
+    b"RIFF\x24\x08\x00\x00AVI LIST",  # RIFF container that is not WAVE
+    b"%PDF-1.7",
+    b"",
+])
+def test_sniff_unknown_signatures(header):
+    assert sniff_audio_mime(header) is None
+
+
+@pytest.mark.parametrize("header", [b"%PDF-1.7\n%\xe2\xe3", b"#!/bin/sh\nrm -rf /\n", b"MZ\x90\x00"])
+def test_non_audio_header_rejected(header):
+    with pytest.raises(ValueError):
+        validate_audio_header(header)
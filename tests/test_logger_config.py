@@ -0,0 +1,47 @@
+import json
+import logging
+
+import pytest
+
+from app_logging import logger_config
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / "app.log"
+    monkeypatch.setattr(logger_config, "LOG_FILE", str(path))
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    logger_config.setup_logger()
+    yield path
+    logger_config._stop_listener()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+def _records(path):
+    logger_config._stop_listener()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_non_native_extra_values_are_written(log_file):
+    logging.getLogger("test").warning("odd extra", extra={"tags": {"a"}, "obj": object()})
+
+    (record,) = _records(log_file)
+    assert record["message"] == "odd extra"
+    assert record["tags"] == "{'a'}"
+    assert record["obj"].startswith("<object object")
+
+
+def test_exc_info_reaches_listener_formatter(log_file):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("test").exception("failed %s", "job")
+
+    (record,) = _records(log_file)
+    assert record["message"] == "failed job"
+    assert "ValueError: boom" in record["exc_info"]
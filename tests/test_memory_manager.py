@@ -0,0 +1,52 @@
+"""Model registry eviction in performance.memory_manager."""
+import pytest
+
+from performance import memory_manager
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(memory_manager, "_LOADED_MODELS", {})
+    monkeypatch.setattr(memory_manager, "_LAST_USED", {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_manager.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_idle_models_are_evicted_busy_ones_kept(clock):
+    unloaded = []
+    memory_manager.register_model("idle", lambda: unloaded.append("idle"))
+    memory_manager.register_model("busy", lambda: unloaded.append("busy"))
+
+    clock[0] += 600
+    memory_manager.touch_model("busy")
+    memory_manager.unload_unused_models(set(), idle_for=300)
+
+    assert unloaded == ["idle"]
+    assert list(memory_manager._LOADED_MODELS) == ["busy"]
+
+
+def test_active_models_are_never_evicted(clock):
+    unloaded = []
+    memory_manager.register_model("serving", lambda: unloaded.append("serving"))
+
+    clock[0] += 600
+    memory_manager.unload_unused_models({"serving"}, idle_for=300)
+    memory_manager.unload_unused_models({"serving"})
+
+    assert unloaded == []
+
+
+def test_aggressive_cleanup_keeps_recently_used_models(clock, monkeypatch):
+    monkeypatch.setattr(memory_manager, "MODEL_IDLE_TIMEOUT", 300)
+    unloaded = []
+    memory_manager.register_model("text-generator", lambda: unloaded.append("text-generator"))
+
+    clock[0] += 10
+    memory_manager.MemoryManager().aggressive_cleanup()
+
+    assert unloaded == []
@@ -0,0 +1,113 @@
+"""Generation-cache behaviour of PostGenerator, against a stand-in FLAN-T5 service."""
+import importlib
+import sys
+import types
+
+import pytest
+
+from performance.generation_cache import generation_cache
+
+
+class FakeFlanT5Service:
+    def __init__(self):
+        self.calls = []
+
+    def generate_text(self, prompt, max_length=None, **kwargs):
+        self.calls.append(("text", max_length, kwargs["do_sample"]))
+        return {"text": f"post {len(self.calls)} at {max_length}"}
+
+    def generate_batch(self, prompts, max_length=None, **kwargs):
+        self.calls.append(("batch", max_length, kwargs["do_sample"]))
+        return [{"text": f"post {len(self.calls)}.{i} at {max_length}"} for i, _ in enumerate(prompts)]
+
+
+@pytest.fixture
+def post_generator(monkeypatch):
+    # The real service imports transformers at module level
+    fake_module = types.ModuleType("services.text_generation.flan_t5_service")
+    fake_module.flan_t5_service = FakeFlanT5Service()
+    fake_module.TextGenerationError = RuntimeError
+    monkeypatch.setitem(sys.modules, "services.text_generation.flan_t5_service", fake_module)
+    monkeypatch.delitem(sys.modules, "services.text_generation.post_generator", raising=False)
+    module = importlib.import_module("services.text_generation.post_generator")
+    generation_cache.clear()
+    yield module
+    generation_cache.clear()
+
+
+def _config(module, **overrides):
+    return module.PostGenerationConfig(min_length=0, **overrides)
+
+
+def test_sampled_posts_are_not_cached(post_generator):
+    generator = post_generator.PostGenerator()
+    config = _config(post_generator)
+
+    first = generator.generate_post("Some transcript", config)["post"]
+    second = generator.generate_post("Some transcript", config)["post"]
+
+    assert first != second
+    assert len(post_generator.flan_t5_service.calls) == 2
+
+
+def test_greedy_posts_are_cached(post_generator):
+    generator = post_generator.PostGenerator()
+    config = _config(post_generator, do_sample=False)
+
+    first = generator.generate_post("Some transcript", config)["post"]
+    second = generator.generate_post("Some transcript", config)["post"]
+
+    assert first == second
+    assert post_generator.flan_t5_service.calls == [("text", 280, False)]
+
+
+def test_batch_cache_key_uses_generation_length(post_generator):
+    generator = post_generator.PostGenerator()
+    short = _config(post_generator, do_sample=False, platform="twitter", max_length=280)
+    long = _config(post_generator, do_sample=False, platform="linkedin", max_length=3000)
+
+    generator.generate_posts_batch("Some transcript", [short, long])
+    assert post_generator.flan_t5_service.calls == [("batch", 3000, False)]
+
+    # The 280-character post was generated at 3000, so a single call must not reuse it
+    generator.generate_post("Some transcript", short)
+    assert post_generator.flan_t5_service.calls[-1] == ("text", 280, False)
+
+    # A batch with the same settings is served from the cache
+    generator.generate_posts_batch("Some transcript", [short, long])
+    assert len(post_generator.flan_t5_service.calls) == 2
+
+
+def test_sampled_batch_skips_cache(post_generator):
+    generator = post_generator.PostGenerator()
+    configs = [_config(post_generator, platform="twitter")]
+
+    generator.generate_posts_batch("Some transcript", configs)
+    generator.generate_posts_batch("Some transcript", configs)
+
+    assert post_generator.flan_t5_service.calls == [("batch", 280, True), ("batch", 280, True)]
+
+
+def test_route_configs_reuse_cached_posts(post_generator):
+    generator = post_generator.PostGenerator()
+    configs = post_generator.platform_configs(["twitter", "linkedin"], tone=post_generator.PostTone.CASUAL)
+
+    first = generator.generate_posts_batch("Some transcript", configs)
+    second = generator.generate_posts_batch("Some transcript", configs)
+
+    assert [r["post"] for r in first] == [r["post"] for r in second]
+    assert post_generator.flan_t5_service.calls == [("batch", 500, False)]
+
+
+def test_route_post_takes_flan_greedy_path(post_generator):
+    # FlanT5Service reuses greedy text only when do_sample is the sole extra setting
+    calls = []
+    post_generator.flan_t5_service.generate_text = (
+        lambda prompt, max_length=None, temperature=None, top_p=None, **kwargs: calls.append(kwargs)
+        or {"text": "post"}
+    )
+    (config,) = post_generator.platform_configs(["twitter"], tone=post_generator.PostTone.CASUAL)
+
+    post_generator.PostGenerator().generate_post("Some transcript", config)
+
+    assert calls == [{"do_sample": False}]
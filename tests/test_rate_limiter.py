@@ -0,0 +1,86 @@
+"""Rate limiting: whitelisted IPs are exempt and per-endpoint limits apply."""
+import pytest
+from flask import Flask
+
+from security.rate_limiter import init_rate_limiter
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    monkeypatch.setenv("GLOBAL_RATE_LIMIT", "2 per hour")
+    monkeypatch.setenv("RATE_LIMIT_WHITELIST", "10.0.0.1, 10.0.0.2")
+
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    init_rate_limiter(app)
+    return app.test_client()
+
+
+def _statuses(client, ip, count=4):
+    return [client.get("/ping", environ_base={"REMOTE_ADDR": ip}).status_code for _ in range(count)]
+
+
+@pytest.mark.parametrize("ip", ["10.0.0.1", "10.0.0.2"])
+def test_every_whitelisted_ip_is_exempt(client, ip):
+    assert _statuses(client, ip) == [200, 200, 200, 200]
+
+
+def test_other_ips_are_limited(client):
+    assert _statuses(client, "192.0.2.7") == [200, 200, 429, 429]
+
+
+def test_no_whitelist_limits_everyone(monkeypatch, client):
+    monkeypatch.setenv("RATE_LIMIT_WHITELIST", "")
+    app = Flask(__name__)
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    init_rate_limiter(app)
+    assert _statuses(app.test_client(), "10.0.0.1") == [200, 200, 429, 429]
+
+
+@pytest.fixture
+def transcribe_client(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    monkeypatch.setenv("GLOBAL_RATE_LIMIT", "100 per hour")
+    monkeypatch.setenv("TRANSCRIBE_RATE_LIMIT", "3 per minute")
+    monkeypatch.setenv("UPLOAD_RATE_LIMIT", "2 per minute")
+    monkeypatch.delenv("RATE_LIMIT_WHITELIST", raising=False)
+
+    app = Flask(__name__)
+
+    @app.route("/api/upload", methods=["POST"])
+    def upload_file():
+        return "uploaded"
+
+    @app.route("/api/transcribe", methods=["POST"])
+    def transcribe_audio():
+        return "queued"
+
+    @app.route("/api/transcribe/stream", methods=["POST"])
+    def transcribe_audio_stream():
+        return "streaming"
+
+    init_rate_limiter(app)
+    return app.test_client()
+
+
+def test_stream_route_gets_transcribe_limit(transcribe_client):
+    statuses = [transcribe_client.post("/api/transcribe/stream").status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_transcribe_routes_share_one_budget(transcribe_client):
+    statuses = [
+        transcribe_client.post(path).status_code
+        for path in ("/api/transcribe", "/api/transcribe/stream", "/api/transcribe", "/api/transcribe/stream")
+    ]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_upload_route_gets_upload_limit(transcribe_client):
+    statuses = [transcribe_client.post("/api/upload").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
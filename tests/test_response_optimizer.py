@@ -0,0 +1,92 @@
+"""ETag / 304 handling through Flask-Compress, as used by the transcription poll."""
+import pytest
+from flask import Flask, jsonify
+
+from performance.response_optimizer import client_has_etag, init_compression, init_response_optimizer
+
+ETAG = "3f2a9c"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/record")
+    def record():
+        response = app.response_class(status=304) if client_has_etag(ETAG) else jsonify({"text": "word " * 200})
+        response.set_etag(ETAG)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    @app.route("/plain")
+    def plain():
+        return jsonify({"ok": True})
+
+    init_response_optimizer(app)
+    init_compression(app)
+    return app.test_client()
+
+
+def test_first_request_returns_body_and_etag(client):
+    response = client.get("/record")
+    assert response.status_code == 200
+    assert response.get_etag()[0] == ETAG
+    assert response.get_json()["text"].startswith("word")
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "identity"])
+def test_repeat_request_with_returned_etag_is_304(client, encoding):
+    headers = {"Accept-Encoding": encoding}
+    first = client.get("/record", headers=headers)
+    # Flask-Compress rewrites the tag to '<etag>:<encoding>' on compressed bodies
+    returned_tag = first.get_etag()[0]
+
+    second = client.get("/record", headers={**headers, "If-None-Match": f'"{returned_tag}"'})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_stale_etag_gets_full_body(client):
+    response = client.get("/record", headers={"If-None-Match": '"outdated"'})
+    assert response.status_code == 200
+    assert response.data
+
+
+def test_only_public_endpoints_use_compressed_body_cache():
+    from performance import response_optimizer
+
+    app = Flask(__name__)
+
+    @app.route("/api/health")
+    def health_check():
+        return jsonify({"status": "healthy", "padding": "x" * 500})
+
+    @app.route("/api/transcription/<transcription_id>")
+    def get_transcription(transcription_id):
+        return jsonify({"text": "private transcript " * 50})
+
+    init_compression(app)
+    client = app.test_client()
+    response_optimizer._encode_cached.cache_clear()
+
+    for _ in range(2):
+        client.get("/api/transcription/abc", headers={"Accept-Encoding": "gzip"})
+    assert response_optimizer._encode_cached.cache_info().currsize == 0
+
+    for _ in range(2):
+        client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    info = response_optimizer._encode_cached.cache_info()
+    assert (info.currsize, info.hits) == (1, 1)
+
+
+def test_revalidated_poll_keeps_its_cache_policy(client):
+    first = client.get("/record")
+    second = client.get("/record", headers={"If-None-Match": f'"{first.get_etag()[0]}"'})
+
+    for response in (first, second):
+        assert response.headers.getlist("Cache-Control") == ["private, no-cache"]
+
+
+def test_responses_without_a_policy_are_not_stored(client):
+    assert client.get("/plain").headers.getlist("Cache-Control") == ["no-store"]
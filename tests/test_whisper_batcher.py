@@ -0,0 +1,53 @@
+"""WhisperBatcher falls back to per-file transcription and resolves every future."""
+from services.whisper_batcher import WhisperBatcher
+
+
+class FakeWhisperService:
+    def __init__(self, supports_batching=True, batch_error=None):
+        self.supports_batching = supports_batching
+        self.batch_error = batch_error
+        self.batch_calls = []
+        self.single_calls = []
+
+    def transcribe_batch(self, file_paths):
+        self.batch_calls.append(list(file_paths))
+        if self.batch_error is not None:
+            raise self.batch_error
+        return [{"text": f"batch:{path}"} for path in file_paths]
+
+    def transcribe_audio(self, file_path):
+        self.single_calls.append(file_path)
+        return {"text": f"single:{file_path}"}
+
+
+def _run(service, paths):
+    # A long wait lets every submitted job land in the same batch
+    batcher = WhisperBatcher(service, batch_size=len(paths), max_wait_ms=2000)
+    futures = [batcher.submit(path) for path in paths]
+    batcher.start()
+    try:
+        return [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.stop()
+
+
+def test_batch_uses_batched_backend():
+    service = FakeWhisperService()
+    results = _run(service, ["a.wav", "b.wav", "c.wav"])
+    assert results == [{"text": "batch:a.wav"}, {"text": "batch:b.wav"}, {"text": "batch:c.wav"}]
+    assert service.batch_calls == [["a.wav", "b.wav", "c.wav"]]
+    assert service.single_calls == []
+
+
+def test_without_batched_backend_each_future_resolves():
+    service = FakeWhisperService(supports_batching=False)
+    results = _run(service, ["a.wav", "b.wav"])
+    assert results == [{"text": "single:a.wav"}, {"text": "single:b.wav"}]
+    assert service.batch_calls == []
+
+
+def test_failed_batch_falls_back_per_file():
+    service = FakeWhisperService(batch_error=RuntimeError("backend crashed"))
+    results = _run(service, ["a.wav", "b.wav"])
+    assert results == [{"text": "single:a.wav"}, {"text": "single:b.wav"}]
+    assert service.single_calls == ["a.wav", "b.wav"]